@@ -2,10 +2,28 @@ from rich.console import Console
 from rich.theme import Theme
 from typer import Option
 
+BATCH_SIZE_OPTION = Option(
+    1000, help="The number of documents that should be included in each batch."
+)
+CHUNK_SIZE_OPTION = Option(
+    None,
+    min=1,
+    help="Send .csv and .ndjson files in chunks of about this many bytes, split on line breaks. csv fields containing line breaks are not supported when chunking",
+)
+CONCURRENCY_OPTION = Option(
+    1,
+    min=1,
+    help="The number of batches to send at the same time. Batches may be enqueued out of order when this is more than 1",
+)
+ENCODING_OPTION = Option("utf-8", help="The encoding type for the file")
 MASTER_KEY_OPTION = Option(
     None, envvar="MEILI_MASTER_KEY", help="The master key for the MeiliSearch instance"
 )
 PANEL_BORDER_COLOR = "sky_blue2"
+PRIMARY_KEY_OPTION = Option(
+    None,
+    help="The primary key for the documents. Will be ignored if a primary key is already set",
+)
 RAW_OPTION = Option(
     False, help="If this flag is set the raw JSON will be displayed instead of the formatted output"
 )
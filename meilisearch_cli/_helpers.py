@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import codecs
 import json
+import mmap
 import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+from itertools import islice
 from pathlib import Path
-from typing import Any, Callable, Generator
+from threading import Timer
+from typing import Any, Callable, Generator, Iterable
 
 from meilisearch.client import Client
 from meilisearch.config import Config
@@ -12,23 +21,42 @@ from meilisearch.index import Index
 from meilisearch.task import get_task
 from rich.console import group
 from rich.panel import Panel
+from typer import BadParameter, echo
 
 from meilisearch_cli._config import PANEL_BORDER_COLOR, SECONDARY_BORDER_COLOR, console
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_INDEX_ERROR_MESSAGES = {
+    "index_already_exists": "Index [error_highlight]{index}[/] already exists",
+    "index_not_found": "Index [error_highlight]{index}[/] not found",
+}
+
+_CONTENT_TYPES = {
+    ".csv": "text/csv",
+    ".json": "application/json",
+    ".ndjson": "application/x-ndjson",
+}
+_JSON_ERROR_SNIPPET_LENGTH = 200
+
 
 def check_index_status(config: Config, index_id: str, task_id: int) -> None:
     result = get_task(config, task_id)
     if result.get("error"):
-        if result["error"]["code"] == "index_already_exists":
-            console.print(f"Index [error_highlight]{index_id}[/] already exists", style="error")
+        message = _INDEX_ERROR_MESSAGES.get(result["error"]["code"])
+        if message:
+            console.print(message.format(index=index_id), style="error")
             sys.exit(0)
-        elif result["error"]["code"] == "index_not_found":
-            console.print(f"Index [error_highlight]{index_id}[/] not found", style="error")
-            sys.exit(0)
-        else:
-            raise MeiliSearchError(result["error"]["message"])
+
+        raise MeiliSearchError(result["error"]["message"])
 
 
+# Clients are cached so repeated calls in the same process share one client. The returned client
+# must not be modified since other callers may be using it.
+@lru_cache(maxsize=4)
 def create_client(url: str | None, master_key: str | None) -> Client:
     if not url and not master_key:
         console.print(
@@ -52,6 +80,46 @@ def create_client(url: str | None, master_key: str | None) -> Client:
     return Client(url, master_key)
 
 
+def key_options(
+    description: str | None,
+    actions: list[str] | None,
+    indexes: list[str] | None,
+    expires_at: datetime | None,
+) -> dict[str, Any]:
+    options = {
+        "description": description,
+        "actions": actions,
+        "indexes": indexes,
+        "expiresAt": expires_at.isoformat() if expires_at else None,
+    }
+    return {k: v for k, v in options.items() if v is not None}
+
+
+@contextmanager
+def delayed_status(status: str, delay: float = 0.25) -> Generator[None, None, None]:
+    # Most requests finish before a spinner would be noticed so it is only shown if the request is
+    # still running after the delay. The spinner is started from the timer's thread so nothing
+    # should be printed inside the block, results are printed once it has exited.
+    spinner = console.status(status)
+    timer = Timer(delay, spinner.start)
+    timer.start()
+    try:
+        yield
+    finally:
+        timer.cancel()
+        timer.join()
+        spinner.stop()
+
+
+@contextmanager
+def client_status(
+    url: str | None, master_key: str | None, status: str
+) -> Generator[Client, None, None]:
+    client = create_client(url, master_key)
+    with delayed_status(status):
+        yield client
+
+
 def create_panel(
     data: dict[str, Any] | list[dict[str, Any]] | str | None,
     *,
@@ -94,21 +162,84 @@ def create_panel(
 
 
 def handle_meilisearch_api_error(error: MeiliSearchApiError, index_name: str) -> None:
-    if error.code == "index_not_found":
-        console.print(f"Index [error_highlight]{index_name}[/] not found", style="error")
+    message = _INDEX_ERROR_MESSAGES.get(error.code or "")
+    if message:
+        console.print(message.format(index=index_name), style="error")
     else:
         raise
 
 
+def handle_index_not_found(func: Callable[..., None]) -> Callable[..., None]:
+    # Commands taking an index argument print a message instead of a traceback when the index
+    # doesn't exist
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> None:
+        try:
+            func(*args, **kwargs)
+        except MeiliSearchApiError as e:
+            handle_meilisearch_api_error(e, kwargs["index"])
+
+    return wrapper
+
+
+def index_route(index: Index, *sub_routes: str) -> str:
+    return "/".join((index.config.paths.index, index.uid, *sub_routes))
+
+
+def is_ndjson(documents: str) -> bool:
+    return documents.lstrip().startswith("{") and "}\n{" in documents
+
+
+def json_dumps(data: Any) -> str:
+    if orjson:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    return json.dumps(data, default=str)
+
+
+def json_loads(data: str | bytes) -> Any:
+    if orjson:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def parse_datetime(value: str | None, param_hint: str) -> datetime | None:
+    if not value:
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise BadParameter(f"{value} is not a valid ISO 8601 date", param_hint=param_hint)
+
+    # The client compares dates with naive UTC times so offsets are converted to UTC
+    if parsed.tzinfo is not None:
+        return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return parsed
+
+
 def print_json_parse_error_message(json_str: str) -> None:
+    # Only echo the start of the input so a malformed multi MB payload doesn't flood the terminal
+    if len(json_str) > _JSON_ERROR_SNIPPET_LENGTH:
+        json_str = f"{json_str[:_JSON_ERROR_SNIPPET_LENGTH]}..."
     console.print(f"Unable to parse [error_highlight]{json_str}[/] as JSON", style="error")
 
 
+def print_raw_json(data: Any) -> None:
+    # Pretty print for people, compact single line JSON when the output is piped to another program
+    if console.is_terminal:
+        console.print_json(data=data, default=str)
+    else:
+        echo(json_dumps(data))
+
+
 def print_panel_or_raw(
     raw: bool, data: dict[str, Any] | list[dict[str, Any]] | None, panel_title: str
 ) -> None:
     if raw:
-        console.print_json(json.dumps(data, default=str))
+        print_raw_json(data)
     else:
         panel = create_panel(data, title=panel_title)
         console.print(panel)
@@ -121,8 +252,9 @@ def process_request(
     wait: bool,
     title: str,
     raw: bool,
+    request_args: tuple[Any, ...] = (),
 ) -> None:
-    update = request_method()
+    update = request_method(*request_args)
 
     if wait:
         if not isinstance(update, list):
@@ -132,7 +264,10 @@ def process_request(
                 print_panel_or_raw(raw, response, "Failed")
                 sys.exit(1)
         else:
-            for u in update:
+            # MeiliSearch processes tasks in the order they were enqueued so once the newest task is
+            # done the others are too. Waiting on it first means only one task is polled repeatedly,
+            # the rest are finished by the time they are checked.
+            for u in sorted(update, key=lambda u: u["uid"], reverse=True):
                 response = index.wait_for_task(u["uid"], timeout_in_ms=600000)
                 if response["status"] == "failed":
                     print_panel_or_raw(raw, response, "Failed")
@@ -144,25 +279,98 @@ def process_request(
         print_panel_or_raw(raw, update, title)
 
 
-def set_search_param(search_params: dict[str, Any], param: Any, param_name: str) -> dict[str, Any]:
-    if param:
-        search_params[param_name] = param
+def require_any_value(*values: Any, message: str) -> None:
+    if not any(values):
+        console.print(message, style="error")
+        sys.exit(1)
+
+
+def read_documents_file(file_path: Path, encoding: str) -> bytes:
+    # MeiliSearch expects UTF-8 so the bytes can be sent as is without decoding them first
+    if codecs.lookup(encoding).name == "utf-8":
+        return file_path.read_bytes()
+
+    return file_path.read_text(encoding=encoding).encode("utf-8")
+
+
+def send_documents_in_batches(
+    request_method: Callable,
+    documents: Iterable[dict[str, Any]],
+    batch_size: int,
+    primary_key: str | None,
+    concurrency: int,
+) -> list[dict[str, Any]]:
+    # The requests are I/O bound so threads are enough to have several batches in flight at once.
+    # At most `concurrency` batches are pending so the documents are only read as they are sent,
+    # and the results are collected in the order the batches were made.
+    documents_iter = iter(documents)
+    batches = iter(lambda: list(islice(documents_iter, batch_size)), [])
+    results: list[dict[str, Any]] = []
+    pending: deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for batch in batches:
+            if len(pending) == concurrency:
+                results.append(pending.popleft().result())
+            pending.append(executor.submit(request_method, batch, primary_key))
+
+        results.extend(future.result() for future in pending)
+
+    return results
+
+
+def split_documents(
+    documents: bytes | mmap.mmap, chunk_size: int, keep_header: bool = False
+) -> Generator[bytes, None, None]:
+    # Chunks end on a newline so no record is cut in half. The header is repeated on each chunk
+    # for csv files.
+    header = b""
+    start = 0
+    size = len(documents)
+    if keep_header:
+        start = documents.find(b"\n") + 1
+        header = documents[:start]
+
+    while start < size:
+        end = documents.find(b"\n", start + chunk_size)
+        end = size if end == -1 else end + 1
+        yield header + documents[start:end]
+        start = end
+
+
+def add_documents_raw_in_chunks(
+    index: Index,
+    file_path: Path,
+    encoding: str,
+    chunk_size: int,
+    primary_key: str | None,
+    content_type: str,
+) -> list[dict[str, Any]]:
+    with ExitStack() as stack:
+        documents: bytes | mmap.mmap
+        # Memory map UTF-8 files so only the chunk being sent is read into memory. Empty files
+        # can't be mapped.
+        if codecs.lookup(encoding).name == "utf-8" and file_path.stat().st_size:
+            f = stack.enter_context(file_path.open("rb"))
+            documents = stack.enter_context(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            documents = read_documents_file(file_path, encoding)
 
-    return search_params
+        return [
+            index.add_documents_raw(chunk, primary_key, content_type)  # type: ignore
+            for chunk in split_documents(documents, chunk_size, content_type == "text/csv")
+        ]
 
 
 def validate_file_type_and_set_content_type(file_path: Path) -> str:
     file_type = file_path.suffix
+    content_type = _CONTENT_TYPES.get(file_type)
 
-    if file_type == ".csv":
-        return "text/csv"
-    elif file_type == ".json":
-        return "application/json"
-    elif file_type == ".ndjson":
-        return "application/x-ndjson"
+    if content_type:
+        return content_type
 
+    *others, last = _CONTENT_TYPES
     console.print(
-        f"[error_highlight]{file_type}[/] files are not accepted. Only .json, .csv, and .ndjson are accepted",
+        f"[error_highlight]{file_type}[/] files are not accepted. Only {', '.join(others)}, and {last} are accepted",
         style="error",
     )
     sys.exit()
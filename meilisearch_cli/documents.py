@@ -1,36 +1,48 @@
 from __future__ import annotations
 
 import json
-from functools import partial
 from pathlib import Path
 from typing import List, Optional
-
-from meilisearch.errors import MeiliSearchApiError
-from rich.traceback import install
-from typer import Argument, Option, Typer
-
-from meilisearch_cli._config import MASTER_KEY_OPTION, RAW_OPTION, URL_OPTION, WAIT_OPTION, console
+from urllib.parse import urlencode
+
+from typer import Argument, Typer
+
+from meilisearch_cli._config import (
+    BATCH_SIZE_OPTION,
+    CHUNK_SIZE_OPTION,
+    CONCURRENCY_OPTION,
+    ENCODING_OPTION,
+    MASTER_KEY_OPTION,
+    PRIMARY_KEY_OPTION,
+    RAW_OPTION,
+    URL_OPTION,
+    WAIT_OPTION,
+    console,
+)
 from meilisearch_cli._helpers import (
+    add_documents_raw_in_chunks,
+    client_status,
     create_client,
-    handle_meilisearch_api_error,
+    handle_index_not_found,
+    index_route,
+    is_ndjson,
+    json_loads,
     print_json_parse_error_message,
     print_panel_or_raw,
     process_request,
+    read_documents_file,
+    send_documents_in_batches,
     validate_file_type_and_set_content_type,
 )
 
-install()
 app = Typer()
 
 
 @app.command()
 def add(
     index: str = Argument(..., help="The name of the index from which to add the documents"),
-    documents: str = Argument(..., help="A JSON string of documents"),
-    primary_key: str = Option(
-        None,
-        help="The primary key for the documents. Will be ignored if a primary key is already set",
-    ),
+    documents: str = Argument(..., help="A JSON or NDJSON string of documents"),
+    primary_key: str = PRIMARY_KEY_OPTION,
     url: Optional[str] = URL_OPTION,
     master_key: Optional[str] = MASTER_KEY_OPTION,
     wait: bool = WAIT_OPTION,
@@ -38,19 +50,30 @@ def add(
 ) -> None:
     """Add documents to an index."""
 
+    # NDJSON is already in a format MeiliSearch accepts so it is sent as is instead of being parsed.
+    # JSON is only parsed to validate it, the original string is sent so the client doesn't have to
+    # serialize the documents again.
+    if is_ndjson(documents):
+        content_type = "application/x-ndjson"
+    else:
+        try:
+            json_loads(documents)
+        except json.decoder.JSONDecodeError:
+            print_json_parse_error_message(documents)
+            return
+        content_type = "application/json"
+
     client_index = create_client(url, master_key).index(index)
-    try:
-        with console.status("Adding documents..."):
-            process_request(
-                client_index,
-                partial(client_index.add_documents, json.loads(documents), primary_key),
-                client_index.get_documents,
-                wait,
-                "Add Documents Result",
-                raw,
-            )
-    except json.decoder.JSONDecodeError:
-        print_json_parse_error_message(documents)
+    with console.status("Adding documents..."):
+        process_request(
+            client_index,
+            client_index.add_documents_raw,
+            client_index.get_documents,
+            wait,
+            "Add Documents Result",
+            raw,
+            request_args=(documents.encode("utf-8"), primary_key, content_type),
+        )
 
 
 @app.command()
@@ -61,11 +84,9 @@ def add_from_file(
         exists=True,
         help="The path to the file containing the documents. Accepted file types are .json, .csv, and .ndjson",
     ),
-    primary_key: str = Option(
-        None,
-        help="The primary key for the documents. Will be ignored if a primary key is already set",
-    ),
-    encoding: str = Option("utf-8", help="The encoding type for the file"),
+    primary_key: str = PRIMARY_KEY_OPTION,
+    encoding: str = ENCODING_OPTION,
+    chunk_size: Optional[int] = CHUNK_SIZE_OPTION,
     url: Optional[str] = URL_OPTION,
     master_key: Optional[str] = MASTER_KEY_OPTION,
     wait: bool = WAIT_OPTION,
@@ -76,31 +97,44 @@ def add_from_file(
     content_type = validate_file_type_and_set_content_type(file_path)
 
     with console.status("Adding documents..."):
-        with open(file_path, "r") as f:
-            documents = f.read().encode(encoding)
-
         client_index = create_client(url, master_key).index(index)
-        process_request(
-            client_index,
-            partial(client_index.add_documents_raw, documents, primary_key, content_type),
-            client_index.get_documents,
-            wait,
-            "Add Documents Result",
-            raw,
-        )
+        if chunk_size and content_type != "application/json":
+            process_request(
+                client_index,
+                add_documents_raw_in_chunks,
+                client_index.get_documents,
+                wait,
+                "Add Documents Result",
+                raw,
+                request_args=(
+                    client_index,
+                    file_path,
+                    encoding,
+                    chunk_size,
+                    primary_key,
+                    content_type,
+                ),
+            )
+        else:
+            documents = read_documents_file(file_path, encoding)
+            process_request(
+                client_index,
+                client_index.add_documents_raw,
+                client_index.get_documents,
+                wait,
+                "Add Documents Result",
+                raw,
+                request_args=(documents, primary_key, content_type),
+            )
 
 
 @app.command()
 def add_in_batches(
     index: str = Argument(..., help="The name of the index from which to add the documents"),
     documents: str = Argument(..., help="A JSON string of documents"),
-    primary_key: str = Option(
-        None,
-        help="The primary key for the documents. Will be ignored if a primary key is already set",
-    ),
-    batch_size: int = Option(
-        1000, help="The number of documents that should be included in each batch."
-    ),
+    primary_key: str = PRIMARY_KEY_OPTION,
+    batch_size: int = BATCH_SIZE_OPTION,
+    concurrency: int = CONCURRENCY_OPTION,
     url: Optional[str] = URL_OPTION,
     master_key: Optional[str] = MASTER_KEY_OPTION,
     wait: bool = WAIT_OPTION,
@@ -108,24 +142,29 @@ def add_in_batches(
 ) -> None:
     """Add documents to an index in batches."""
 
-    client_index = create_client(url, master_key).index(index)
     try:
-        with console.status("Adding documents..."):
-            process_request(
-                client_index,
-                partial(
-                    client_index.add_documents_in_batches,
-                    json.loads(documents),
-                    batch_size,
-                    primary_key,
-                ),
-                client_index.get_documents,
-                wait,
-                "Add Documents Result",
-                raw,
-            )
+        parsed_documents = json_loads(documents)
     except json.decoder.JSONDecodeError:
         print_json_parse_error_message(documents)
+        return
+
+    client_index = create_client(url, master_key).index(index)
+    with console.status("Adding documents..."):
+        process_request(
+            client_index,
+            send_documents_in_batches,
+            client_index.get_documents,
+            wait,
+            "Add Documents Result",
+            raw,
+            request_args=(
+                client_index.add_documents,
+                parsed_documents,
+                batch_size,
+                primary_key,
+                concurrency,
+            ),
+        )
 
 
 @app.command()
@@ -142,7 +181,7 @@ def delete_all(
     with console.status("Deleting all documents..."):
         process_request(
             client_index,
-            partial(client_index.delete_all_documents),
+            client_index.delete_all_documents,
             client_index.get_documents,
             wait,
             "Delete Documents Result",
@@ -165,11 +204,12 @@ def delete(
     with console.status("Deleting document..."):
         process_request(
             client_index,
-            partial(client_index.delete_document, document_id),
+            client_index.delete_document,
             client_index.get_documents,
             wait,
             "Delete Document Result",
             raw,
+            request_args=(document_id,),
         )
 
 
@@ -188,15 +228,17 @@ def delete_multiple(
     with console.status("Deleting documents..."):
         process_request(
             client_index,
-            partial(client_index.delete_documents, document_ids),
+            client_index.delete_documents,
             client_index.get_documents,
             wait,
             "Delete Documents Result",
             raw,
+            request_args=(document_ids,),
         )
 
 
 @app.command()
+@handle_index_not_found
 def get(
     index: str = Argument(..., help="The name of the index from which to retrieve the document"),
     document_id: str = Argument(..., help="The id of the document to retrieve"),
@@ -206,16 +248,14 @@ def get(
 ) -> None:
     """Get a document from an index."""
 
-    client = create_client(url, master_key)
-    try:
-        with console.status("Getting document..."):
-            document = client.index(index).get_document(document_id)
-            print_panel_or_raw(raw, document, "Document")
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with client_status(url, master_key, "Getting document...") as client:
+        document = client.index(index).get_document(document_id)
+
+    print_panel_or_raw(raw, document, "Document")
 
 
 @app.command()
+@handle_index_not_found
 def get_all(
     index: str = Argument(..., help="The name of the index from which to retrieve the documents"),
     url: Optional[str] = URL_OPTION,
@@ -223,23 +263,17 @@ def get_all(
     raw: bool = RAW_OPTION,
 ) -> None:
     """Get all documents from an index."""
-    client = create_client(url, master_key)
-    try:
-        with console.status("Getting documents..."):
-            status = client.index(index).get_documents()
-            print_panel_or_raw(raw, status, "Documents")
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with client_status(url, master_key, "Getting documents...") as client:
+        status = client.index(index).get_documents()
+
+    print_panel_or_raw(raw, status, "Documents")
 
 
 @app.command()
 def update(
     index: str = Argument(..., help="The name of the index from which to update the documents"),
     documents: str = Argument(..., help="A JSON string of documents"),
-    primary_key: str = Option(
-        None,
-        help="The primary key for the documents. Will be ignored if a primary key is already set",
-    ),
+    primary_key: str = PRIMARY_KEY_OPTION,
     url: Optional[str] = URL_OPTION,
     master_key: Optional[str] = MASTER_KEY_OPTION,
     wait: bool = WAIT_OPTION,
@@ -247,19 +281,31 @@ def update(
 ) -> None:
     """Update documents in an index."""
 
-    client_index = create_client(url, master_key).index(index)
+    # The documents are only parsed to validate them, the original string is sent so the client
+    # doesn't have to serialize them again.
     try:
-        with console.status("Updating documents..."):
-            process_request(
-                client_index,
-                partial(client_index.update_documents, json.loads(documents), primary_key),
-                client_index.get_documents,
-                wait,
-                "Update Documents",
-                raw,
-            )
+        json_loads(documents)
     except json.decoder.JSONDecodeError:
         print_json_parse_error_message(documents)
+        return
+
+    client_index = create_client(url, master_key).index(index)
+    # Same route as the client builds for update_documents, which has no raw variant to send the
+    # string through
+    route = index_route(client_index, client_index.config.paths.document)
+    if primary_key is not None:
+        route = f"{route}?{urlencode({'primaryKey': primary_key})}"
+
+    with console.status("Updating documents..."):
+        process_request(
+            client_index,
+            client_index.http.put,
+            client_index.get_documents,
+            wait,
+            "Update Documents",
+            raw,
+            request_args=(route, documents.encode("utf-8")),
+        )
 
 
 @app.command()
@@ -270,11 +316,9 @@ def update_from_file(
         exists=True,
         help="The path to the file containing the documents. Accepted file types are .json, .csv, and .ndjson",
     ),
-    primary_key: str = Option(
-        None,
-        help="The primary key for the documents. Will be ignored if a primary key is already set",
-    ),
-    encoding: str = Option("utf-8", help="The encoding type for the file"),
+    primary_key: str = PRIMARY_KEY_OPTION,
+    encoding: str = ENCODING_OPTION,
+    chunk_size: Optional[int] = CHUNK_SIZE_OPTION,
     url: Optional[str] = URL_OPTION,
     master_key: Optional[str] = MASTER_KEY_OPTION,
     wait: bool = WAIT_OPTION,
@@ -285,31 +329,44 @@ def update_from_file(
     content_type = validate_file_type_and_set_content_type(file_path)
 
     with console.status("Adding documents..."):
-        with open(file_path, "r") as f:
-            documents = f.read().encode(encoding)
-
         client_index = create_client(url, master_key).index(index)
-        process_request(
-            client_index,
-            partial(client_index.add_documents_raw, documents, primary_key, content_type),
-            client_index.get_documents,
-            wait,
-            "Update Documents",
-            raw,
-        )
+        if chunk_size and content_type != "application/json":
+            process_request(
+                client_index,
+                add_documents_raw_in_chunks,
+                client_index.get_documents,
+                wait,
+                "Update Documents",
+                raw,
+                request_args=(
+                    client_index,
+                    file_path,
+                    encoding,
+                    chunk_size,
+                    primary_key,
+                    content_type,
+                ),
+            )
+        else:
+            documents = read_documents_file(file_path, encoding)
+            process_request(
+                client_index,
+                client_index.add_documents_raw,
+                client_index.get_documents,
+                wait,
+                "Update Documents",
+                raw,
+                request_args=(documents, primary_key, content_type),
+            )
 
 
 @app.command()
 def update_in_batches(
     index: str = Argument(..., help="The name of the index from which to add the documents"),
     documents: str = Argument(..., help="A JSON string of documents"),
-    primary_key: str = Option(
-        None,
-        help="The primary key for the documents. Will be ignored if a primary key is already set",
-    ),
-    batch_size: int = Option(
-        1000, help="The number of documents that should be included in each batch."
-    ),
+    primary_key: str = PRIMARY_KEY_OPTION,
+    batch_size: int = BATCH_SIZE_OPTION,
+    concurrency: int = CONCURRENCY_OPTION,
     url: Optional[str] = URL_OPTION,
     master_key: Optional[str] = MASTER_KEY_OPTION,
     wait: bool = WAIT_OPTION,
@@ -317,24 +374,29 @@ def update_in_batches(
 ) -> None:
     """Add documents to an index in batches."""
 
-    client_index = create_client(url, master_key).index(index)
     try:
-        with console.status("Adding documents..."):
-            process_request(
-                client_index,
-                partial(
-                    client_index.update_documents_in_batches,
-                    json.loads(documents),
-                    batch_size,
-                    primary_key,
-                ),
-                client_index.get_documents,
-                wait,
-                "Update Documents",
-                raw,
-            )
+        parsed_documents = json_loads(documents)
     except json.decoder.JSONDecodeError:
         print_json_parse_error_message(documents)
+        return
+
+    client_index = create_client(url, master_key).index(index)
+    with console.status("Adding documents..."):
+        process_request(
+            client_index,
+            send_documents_in_batches,
+            client_index.get_documents,
+            wait,
+            "Update Documents",
+            raw,
+            request_args=(
+                client_index.update_documents,
+                parsed_documents,
+                batch_size,
+                primary_key,
+                concurrency,
+            ),
+        )
 
 
 if __name__ == "__main__":
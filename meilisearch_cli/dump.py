@@ -2,13 +2,11 @@ from __future__ import annotations
 
 from typing import Optional
 
-from rich.traceback import install
 from typer import Argument, Typer
 
 from meilisearch_cli._config import MASTER_KEY_OPTION, RAW_OPTION, URL_OPTION, console
 from meilisearch_cli._helpers import create_client, print_panel_or_raw
 
-install()
 app = Typer()
 
 
@@ -2,29 +2,29 @@ from __future__ import annotations
 
 import json
 import sys
-from functools import partial
 from typing import Any, List, Optional
 
-from meilisearch.errors import MeiliSearchApiError
-from rich.traceback import install
 from typer import Argument, Option, Typer
 
 from meilisearch_cli._config import MASTER_KEY_OPTION, RAW_OPTION, URL_OPTION, WAIT_OPTION, console
 from meilisearch_cli._helpers import (
     check_index_status,
+    client_status,
     create_client,
     create_panel,
-    handle_meilisearch_api_error,
+    handle_index_not_found,
+    index_route,
+    json_loads,
     print_json_parse_error_message,
     print_panel_or_raw,
     process_request,
 )
 
-install()
 app = Typer()
 
 
 @app.command()
+@handle_index_not_found
 def create(
     index: str = Argument(..., help="The name of the index to create"),
     primary_key: Optional[str] = Option(None, help="The primary key of the index"),
@@ -34,27 +34,24 @@ def create(
 ) -> None:
     """Create an index."""
 
-    client = create_client(url, master_key)
-    try:
-        with console.status("Creating index..."):
-            if primary_key:
-                response = client.create_index(index, {"primaryKey": primary_key})
-            else:
-                response = client.create_index(index)
+    with client_status(url, master_key, "Creating index...") as client:
+        if primary_key:
+            response = client.create_index(index, {"primaryKey": primary_key})
+        else:
+            response = client.create_index(index)
 
-            client.wait_for_task(response["uid"])
-            check_index_status(client.config, index, response["uid"])
+        client.wait_for_task(response["uid"])
 
-        client_index = client.get_index(index)
-        index_dict = client_index.__dict__
-        del index_dict["config"]
-        del index_dict["http"]
-        print_panel_or_raw(raw, index_dict, "Index")
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    check_index_status(client.config, index, response["uid"])
+    client_index = client.get_index(index)
+    index_dict = client_index.__dict__
+    del index_dict["config"]
+    del index_dict["http"]
+    print_panel_or_raw(raw, index_dict, "Index")
 
 
 @app.command()
+@handle_index_not_found
 def delete(
     index: str = Argument(..., help="The name of the index to delete"),
     url: Optional[str] = URL_OPTION,
@@ -62,24 +59,21 @@ def delete(
 ) -> None:
     """Delete an index."""
 
-    client = create_client(url, master_key)
-    try:
-        with console.status("Deleting the index..."):
-            response = client.index(index).delete()
-            client.wait_for_task(response["uid"])
-            check_index_status(client.config, index, response["uid"])
-
-        console.print(
-            create_panel(
-                f"Index {index} successfully deleted",
-                title="Delete Index",
-            )
+    with client_status(url, master_key, "Deleting the index...") as client:
+        response = client.index(index).delete()
+        client.wait_for_task(response["uid"])
+
+    check_index_status(client.config, index, response["uid"])
+    console.print(
+        create_panel(
+            f"Index {index} successfully deleted",
+            title="Delete Index",
         )
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    )
 
 
 @app.command()
+@handle_index_not_found
 def get(
     index: str = Argument(..., help="The name of the index to retrieve"),
     url: Optional[str] = URL_OPTION,
@@ -88,13 +82,10 @@ def get(
 ) -> None:
     """Gets a single index."""
 
-    client = create_client(url, master_key)
-    try:
-        with console.status("Getting index..."):
-            returned_index = client.get_raw_index(index)
-            print_panel_or_raw(raw, returned_index, "Index")
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with client_status(url, master_key, "Getting index...") as client:
+        returned_index = client.get_raw_index(index)
+
+    print_panel_or_raw(raw, returned_index, "Index")
 
 
 @app.command()
@@ -105,13 +96,14 @@ def get_all(
 ) -> None:
     """Get all indexes."""
 
-    client = create_client(url, master_key)
-    with console.status("Getting indexes..."):
+    with client_status(url, master_key, "Getting indexes...") as client:
         indexes = client.get_raw_indexes()
-        print_panel_or_raw(raw, indexes, "All Indexes")
+
+    print_panel_or_raw(raw, indexes, "All Indexes")
 
 
 @app.command()
+@handle_index_not_found
 def get_primary_key(
     index: str = Argument(..., help="The name of the index from which to retrieve the primary key"),
     url: Optional[str] = URL_OPTION,
@@ -119,17 +111,15 @@ def get_primary_key(
 ) -> None:
     """Get the primary key of an index."""
 
-    client = create_client(url, master_key)
-    try:
-        with console.status("Getting primary key..."):
-            primary_key = client.index(index).get_primary_key()
-            panel = create_panel(primary_key, title="Primary Key")
-            console.print(panel)
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with client_status(url, master_key, "Getting primary key...") as client:
+        primary_key = client.index(index).get_primary_key()
+
+    panel = create_panel(primary_key, title="Primary Key")
+    console.print(panel)
 
 
 @app.command()
+@handle_index_not_found
 def get_stats(
     index: str = Argument(..., help="The name of the index from which to retrieve the stats"),
     url: Optional[str] = URL_OPTION,
@@ -138,16 +128,14 @@ def get_stats(
 ) -> None:
     """Get the stats of an index."""
 
-    client = create_client(url, master_key)
-    try:
-        with console.status("Getting stats..."):
-            settings = client.index(index).get_stats()
-            print_panel_or_raw(raw, settings, "Stats")
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with client_status(url, master_key, "Getting stats...") as client:
+        settings = client.index(index).get_stats()
+
+    print_panel_or_raw(raw, settings, "Stats")
 
 
 @app.command()
+@handle_index_not_found
 def get_tasks(
     index: str = Argument(
         ..., help="The name of the index from which to retrieve the update status"
@@ -158,16 +146,14 @@ def get_tasks(
 ) -> None:
     """Get all update statuses of an index."""
 
-    client = create_client(url, master_key)
-    try:
-        with console.status("Getting update status..."):
-            status = client.index(index).get_tasks()
-            print_panel_or_raw(raw, status, "Update Status")
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with client_status(url, master_key, "Getting update status...") as client:
+        status = client.index(index).get_tasks()
+
+    print_panel_or_raw(raw, status, "Update Status")
 
 
 @app.command()
+@handle_index_not_found
 def get_settings(
     index: str = Argument(..., help="The name of the index from which to retrieve the settings"),
     url: Optional[str] = URL_OPTION,
@@ -176,16 +162,14 @@ def get_settings(
 ) -> None:
     """Get the settings of an index."""
 
-    client = create_client(url, master_key)
-    try:
-        with console.status("Getting settings..."):
-            settings = client.index(index).get_settings()
-            print_panel_or_raw(raw, settings, "Settings")
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with client_status(url, master_key, "Getting settings...") as client:
+        settings = client.index(index).get_settings()
+
+    print_panel_or_raw(raw, settings, "Settings")
 
 
 @app.command()
+@handle_index_not_found
 def get_task(
     index: str = Argument(
         ..., help="The name of the index from which to retrieve the update status"
@@ -197,16 +181,14 @@ def get_task(
 ) -> None:
     """Get the update status of an index."""
 
-    client = create_client(url, master_key)
-    try:
-        with console.status("Getting update status..."):
-            status = client.index(index).get_task(update_id)
-            print_panel_or_raw(raw, status, "Update Status")
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with client_status(url, master_key, "Getting update status...") as client:
+        status = client.index(index).get_task(update_id)
+
+    print_panel_or_raw(raw, status, "Update Status")
 
 
 @app.command()
+@handle_index_not_found
 def reset_displayed_attributes(
     index: str = Argument(
         ..., help="The name of the index for which to reset the displayed attributes"
@@ -219,21 +201,19 @@ def reset_displayed_attributes(
     """Reset displayed attributes of an index."""
 
     client_index = create_client(url, master_key).index(index)
-    try:
-        with console.status("Resetting displayed attributes..."):
-            process_request(
-                client_index,
-                client_index.reset_displayed_attributes,
-                client_index.get_displayed_attributes,
-                wait,
-                "Reset Displayed Attributes",
-                raw,
-            )
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with console.status("Resetting displayed attributes..."):
+        process_request(
+            client_index,
+            client_index.reset_displayed_attributes,
+            client_index.get_displayed_attributes,
+            wait,
+            "Reset Displayed Attributes",
+            raw,
+        )
 
 
 @app.command()
+@handle_index_not_found
 def reset_distinct_attribute(
     index: str = Argument(
         ..., help="The name of the index for which to reset the distinct attribute"
@@ -246,21 +226,19 @@ def reset_distinct_attribute(
     """Reset distinct attribute of an index."""
 
     client_index = create_client(url, master_key).index(index)
-    try:
-        with console.status("Resetting distinct attribute..."):
-            process_request(
-                client_index,
-                client_index.reset_distinct_attribute,
-                client_index.get_distinct_attribute,
-                wait,
-                "Reset Distinct Attribute",
-                raw,
-            )
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with console.status("Resetting distinct attribute..."):
+        process_request(
+            client_index,
+            client_index.reset_distinct_attribute,
+            client_index.get_distinct_attribute,
+            wait,
+            "Reset Distinct Attribute",
+            raw,
+        )
 
 
 @app.command()
+@handle_index_not_found
 def reset_filterable_attributes(
     index: str = Argument(
         ..., help="The name of the index for which to reset the filterable attributes"
@@ -273,21 +251,19 @@ def reset_filterable_attributes(
     """Reset filterable attributes of an index."""
 
     client_index = create_client(url, master_key).index(index)
-    try:
-        with console.status("Resetting filterable attributes..."):
-            process_request(
-                client_index,
-                client_index.reset_filterable_attributes,
-                client_index.get_filterable_attributes,
-                wait,
-                "Reset Filterable Attributes",
-                raw,
-            )
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with console.status("Resetting filterable attributes..."):
+        process_request(
+            client_index,
+            client_index.reset_filterable_attributes,
+            client_index.get_filterable_attributes,
+            wait,
+            "Reset Filterable Attributes",
+            raw,
+        )
 
 
 @app.command()
+@handle_index_not_found
 def reset_ranking_rules(
     index: str = Argument(..., help="The name of the index for which to reset the ranking rules"),
     url: Optional[str] = URL_OPTION,
@@ -298,21 +274,19 @@ def reset_ranking_rules(
     """Reset ranking rules of an index."""
 
     client_index = create_client(url, master_key).index(index)
-    try:
-        with console.status("Resetting ranking rules..."):
-            process_request(
-                client_index,
-                client_index.reset_ranking_rules,
-                client_index.get_ranking_rules,
-                wait,
-                "Reset Ranking Rules",
-                raw,
-            )
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with console.status("Resetting ranking rules..."):
+        process_request(
+            client_index,
+            client_index.reset_ranking_rules,
+            client_index.get_ranking_rules,
+            wait,
+            "Reset Ranking Rules",
+            raw,
+        )
 
 
 @app.command()
+@handle_index_not_found
 def reset_searchable_attributes(
     index: str = Argument(
         ..., help="The name of the index for which to reset the searchable attributes"
@@ -325,21 +299,19 @@ def reset_searchable_attributes(
     """Reset searchable attributes of an index."""
 
     client_index = create_client(url, master_key).index(index)
-    try:
-        with console.status("Resetting searchable attributes..."):
-            process_request(
-                client_index,
-                client_index.reset_searchable_attributes,
-                client_index.get_searchable_attributes,
-                wait,
-                "Reset Searchable Attributes",
-                raw,
-            )
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with console.status("Resetting searchable attributes..."):
+        process_request(
+            client_index,
+            client_index.reset_searchable_attributes,
+            client_index.get_searchable_attributes,
+            wait,
+            "Reset Searchable Attributes",
+            raw,
+        )
 
 
 @app.command()
+@handle_index_not_found
 def reset_settings(
     index: str = Argument(..., help="The name of the index for which to reset the settings"),
     url: Optional[str] = URL_OPTION,
@@ -350,21 +322,19 @@ def reset_settings(
     """Reset all settings of an index."""
 
     client_index = create_client(url, master_key).index(index)
-    try:
-        with console.status("Resetting settings..."):
-            process_request(
-                client_index,
-                client_index.reset_settings,
-                client_index.get_settings,
-                wait,
-                "Reset Settings",
-                raw,
-            )
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with console.status("Resetting settings..."):
+        process_request(
+            client_index,
+            client_index.reset_settings,
+            client_index.get_settings,
+            wait,
+            "Reset Settings",
+            raw,
+        )
 
 
 @app.command()
+@handle_index_not_found
 def reset_stop_words(
     index: str = Argument(..., help="The name of the index for which to reset the stop words"),
     url: Optional[str] = URL_OPTION,
@@ -375,21 +345,19 @@ def reset_stop_words(
     """Reset stop words of an index."""
 
     client_index = create_client(url, master_key).index(index)
-    try:
-        with console.status("Resetting stop words..."):
-            process_request(
-                client_index,
-                client_index.reset_stop_words,
-                client_index.get_stop_words,
-                wait,
-                "Reset Stop Words",
-                raw,
-            )
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with console.status("Resetting stop words..."):
+        process_request(
+            client_index,
+            client_index.reset_stop_words,
+            client_index.get_stop_words,
+            wait,
+            "Reset Stop Words",
+            raw,
+        )
 
 
 @app.command()
+@handle_index_not_found
 def reset_synonyms(
     index: str = Argument(..., help="The name of the index for which to reset the synonyms"),
     url: Optional[str] = URL_OPTION,
@@ -400,21 +368,19 @@ def reset_synonyms(
     """Reset synonyms of an index."""
 
     client_index = create_client(url, master_key).index(index)
-    try:
-        with console.status("Resetting synonyms..."):
-            process_request(
-                client_index,
-                client_index.reset_synonyms,
-                client_index.get_synonyms,
-                wait,
-                "Reset Synonyms",
-                raw,
-            )
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with console.status("Resetting synonyms..."):
+        process_request(
+            client_index,
+            client_index.reset_synonyms,
+            client_index.get_synonyms,
+            wait,
+            "Reset Synonyms",
+            raw,
+        )
 
 
 @app.command()
+@handle_index_not_found
 def reset_typo_tolerance(
     index: str = Argument(..., help="The name of the index for which to reset the typo tolerance"),
     url: Optional[str] = URL_OPTION,
@@ -425,18 +391,15 @@ def reset_typo_tolerance(
     """Reset typo tolerance of an index."""
 
     client_index = create_client(url, master_key).index(index)
-    try:
-        with console.status("Resetting typo tolerance..."):
-            process_request(
-                client_index,
-                client_index.reset_typo_tolerance,
-                client_index.get_typo_tolerance,
-                wait,
-                "Reset Typo Tolerance",
-                raw,
-            )
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    with console.status("Resetting typo tolerance..."):
+        process_request(
+            client_index,
+            client_index.reset_typo_tolerance,
+            client_index.get_typo_tolerance,
+            wait,
+            "Reset Typo Tolerance",
+            raw,
+        )
 
 
 @app.command()
@@ -456,11 +419,12 @@ def update_displayed_attributes(
     with console.status("Updating displayed attributes..."):
         process_request(
             client_index,
-            partial(client_index.update_displayed_attributes, displayed_attributes),
+            client_index.update_displayed_attributes,
             client_index.get_displayed_attributes,
             wait,
             "Update Displayed Attributes",
             raw,
+            request_args=(displayed_attributes,),
         )
 
 
@@ -481,15 +445,17 @@ def update_distinct_attribute(
     with console.status("Updating distinct attribute..."):
         process_request(
             client_index,
-            partial(client_index.update_distinct_attribute, distinct_attribute),  # type: ignore
+            client_index.update_distinct_attribute,
             client_index.get_distinct_attribute,
             wait,
             "Update Distinct Attribute",
             raw,
+            request_args=(distinct_attribute,),
         )
 
 
 @app.command()
+@handle_index_not_found
 def update(
     index: str = Argument(
         ..., help="The name of the index for which the settings should be updated"
@@ -501,29 +467,24 @@ def update(
 ) -> None:
     """Update an index."""
 
-    client = create_client(url, master_key)
-    try:
-        with console.status("Updating index..."):
-            update_response = client.index(index).update(primary_key=primary_key)
-            status = client.wait_for_task(update_response["uid"])
-            if status["status"] == "failed":
-                console.print(status)
-                sys.exit(1)
+    with client_status(url, master_key, "Updating index...") as client:
+        update_response = client.index(index).update(primary_key=primary_key)
+        status = client.wait_for_task(update_response["uid"])
+        if status["status"] != "failed":
             response = client.get_index(index).__dict__
 
-        index_display = {
-            "uid": response["uid"],
-            "primary_key": response["primary_key"],
-            "created_at": str(response["created_at"]),
-            "updated_at": str(response["updated_at"]),
-        }
+    if status["status"] == "failed":
+        print_panel_or_raw(raw, status, "Failed")
+        sys.exit(1)
 
-        if raw:
-            console.print_json(json.dumps(index_display))
-        else:
-            console.print(index_display)
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    index_display = {
+        "uid": response["uid"],
+        "primary_key": response["primary_key"],
+        "created_at": str(response["created_at"]),
+        "updated_at": str(response["updated_at"]),
+    }
+
+    print_panel_or_raw(raw, index_display, "Index")
 
 
 @app.command()
@@ -541,11 +502,12 @@ def update_ranking_rules(
     with console.status("Updating ranking rules..."):
         process_request(
             client_index,
-            partial(client_index.update_ranking_rules, ranking_rules),
+            client_index.update_ranking_rules,
             client_index.get_ranking_rules,
             wait,
             "Update Ranking Rules",
             raw,
+            request_args=(ranking_rules,),
         )
 
 
@@ -566,11 +528,12 @@ def update_searchable_attributes(
     with console.status("Updating searchable attributes..."):
         process_request(
             client_index,
-            partial(client_index.update_searchable_attributes, searchable_attributes),
+            client_index.update_searchable_attributes,
             client_index.get_searchable_attributes,
             wait,
             "Update Searchable Attributes",
             raw,
+            request_args=(searchable_attributes,),
         )
 
 
@@ -619,15 +582,16 @@ def update_settings(
         if stop_words:
             settings["stopWords"] = stop_words
         if synonyms:
-            settings["synonyms"] = json.loads(synonyms)
+            settings["synonyms"] = json_loads(synonyms)
         with console.status("Updating settings..."):
             process_request(
                 client_index,
-                partial(client_index.update_settings, settings),
+                client_index.update_settings,
                 client_index.get_settings,
                 wait,
                 "Update Settings",
                 raw,
+                request_args=(settings,),
             )
     except json.decoder.JSONDecodeError:
         print_json_parse_error_message(synonyms)
@@ -650,11 +614,12 @@ def update_sortable_attributes(
     with console.status("Updating sortable attributes..."):
         process_request(
             client_index,
-            partial(client_index.update_sortable_attributes, sortable_attributes),
+            client_index.update_sortable_attributes,
             client_index.get_sortable_attributes,
             wait,
             "Update Searchable Attributes",
             raw,
+            request_args=(sortable_attributes,),
         )
 
 
@@ -673,11 +638,12 @@ def update_stop_words(
     with console.status("Updating stop words..."):
         process_request(
             client_index,
-            partial(client_index.update_stop_words, stop_words),
+            client_index.update_stop_words,
             client_index.get_stop_words,
             wait,
             "Update Stop Words",
             raw,
+            request_args=(stop_words,),
         )
 
 
@@ -694,19 +660,28 @@ def update_synonyms(
 ) -> None:
     """Update the synonyms of an index."""
 
-    client_index = create_client(url, master_key).index(index)
+    # The synonyms are only parsed to validate them, the original string is sent so the client
+    # doesn't have to serialize them again.
     try:
-        with console.status("Updating synonyms..."):
-            process_request(
-                client_index,
-                partial(client_index.update_synonyms, json.loads(synonyms)),
-                client_index.get_synonyms,
-                wait,
-                "Update Synonyms",
-                raw,
-            )
+        json_loads(synonyms)
     except json.decoder.JSONDecodeError:
         print_json_parse_error_message(synonyms)
+        return
+
+    client_index = create_client(url, master_key).index(index)
+    route = index_route(
+        client_index, client_index.config.paths.setting, client_index.config.paths.synonyms
+    )
+    with console.status("Updating synonyms..."):
+        process_request(
+            client_index,
+            client_index.http.post,
+            client_index.get_synonyms,
+            wait,
+            "Update Synonyms",
+            raw,
+            request_args=(route, synonyms.encode("utf-8")),
+        )
 
 
 @app.command()
@@ -727,11 +702,12 @@ def update_typo_tolerance(
         with console.status("Updating typo tolerance..."):
             process_request(
                 client_index,
-                partial(client_index.update_typo_tolerance, json.loads(typo_tolerance)),
+                client_index.update_typo_tolerance,
                 client_index.get_typo_tolerance,
                 wait,
                 "Update Typo Tolerance",
                 raw,
+                request_args=(json_loads(typo_tolerance),),
             )
     except json.decoder.JSONDecodeError:
         print_json_parse_error_message(typo_tolerance)
@@ -2,17 +2,25 @@ from __future__ import annotations
 
 import json
 import sys
-from datetime import datetime
-from typing import Any, List, Optional
-
-from meilisearch.client import Client
-from meilisearch.errors import MeiliSearchApiError
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib import import_module
+from typing import List, Optional
+
+import requests
+from click import Command, Context
+from meilisearch.errors import (
+    MeiliSearchApiError,
+    MeiliSearchCommunicationError,
+    MeiliSearchTimeoutError,
+)
 from rich.console import Group
+from rich.markup import escape
 from rich.panel import Panel
-from rich.traceback import install
 from typer import Argument, Exit, Option, Typer, echo
+from typer.core import TyperGroup
+from typer.main import get_group
 
-from meilisearch_cli import documents, dump, index
 from meilisearch_cli._config import (
     MASTER_KEY_OPTION,
     PANEL_BORDER_COLOR,
@@ -20,28 +28,82 @@ from meilisearch_cli._config import (
     URL_OPTION,
     console,
 )
-from meilisearch_cli._docs import build_docs_tree
 from meilisearch_cli._helpers import (
+    client_status,
     create_client,
     create_panel,
-    handle_meilisearch_api_error,
+    delayed_status,
+    handle_index_not_found,
+    json_loads,
+    key_options,
+    parse_datetime,
     print_panel_or_raw,
-    set_search_param,
+    print_raw_json,
+    require_any_value,
 )
 
-install()
-
 __version__ = "0.11.0"
 
-app = Typer()
-app.add_typer(documents.app, name="documents", help="Manage documents in an index.")
-app.add_typer(dump.app, name="dump", help="Create and get status of dumps.")
-app.add_typer(index.app, name="index", help="Manage indexes")
+
+class LazySubcommandGroup(TyperGroup):
+    """Only imports a subcommand module when that subcommand is requested."""
+
+    lazy_subcommands = {
+        "documents": ("meilisearch_cli.documents", "Manage documents in an index."),
+        "dump": ("meilisearch_cli.dump", "Create and get status of dumps."),
+        "index": ("meilisearch_cli.index", "Manage indexes"),
+    }
+
+    def list_commands(self, ctx: Context) -> list[str]:
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(self, ctx: Context, cmd_name: str) -> Command | None:
+        if cmd_name not in self.lazy_subcommands:
+            return super().get_command(ctx, cmd_name)
+
+        return self._load_subcommand(cmd_name)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _load_subcommand(cls, cmd_name: str) -> Command:
+        # Building the click group is only done once when the app is invoked more than once in
+        # the same process
+        module_name, help_text = cls.lazy_subcommands[cmd_name]
+        command = get_group(import_module(module_name).app)
+        command.name = cmd_name
+        command.help = help_text
+        return command
+
+
+app = Typer(cls=LazySubcommandGroup)
+
+# MeiliSearch names of the search parameters, in the same order as the values are collected in search
+_SEARCH_KEYS = (
+    "offset",
+    "limit",
+    "filter",
+    "facetsDistribution",
+    "attributesToRetrieve",
+    "attributesToCrop",
+    "cropLength",
+    "attributesToHighlight",
+    "matches",
+    "sort",
+    "highlightPreTag",
+    "highlightPostTag",
+    "cropMarker",
+)
+# Above this many hits the results are printed as JSON since building panels for every hit is slow
+_COMPACT_HITS_THRESHOLD = 100
 
 
 @app.command()
 def docs() -> None:
     """A tree of all documentation links. If supported by your terminal the links are clickable."""
+    # beautifulsoup is only needed here so it is imported when the command runs instead of slowing
+    # down the start up of every other command.
+    from meilisearch_cli._docs import build_docs_tree
+
     with console.status("Getting documentation links..."):
         console.print(build_docs_tree())
 
@@ -50,21 +112,21 @@ def docs() -> None:
 def api_docs_link() -> None:
     """Gives a clickable link to the MeiliSearch API documenation. This can be used in terminals that don't support links."""
 
-    console.print("https://docs.meilisearch.com/reference/api/")
+    echo("https://docs.meilisearch.com/reference/api/")
 
 
 @app.command()
 def docs_link() -> None:
     """Gives a clickable link to the MeiliSearch documenation. This can be used in terminals that don't support links."""
 
-    console.print("https://docs.meilisearch.com/")
+    echo("https://docs.meilisearch.com/")
 
 
 @app.command()
 def generate_tenant_token(
     search_rules: str = Argument(..., help="The search rules to use for the tenant token"),
     api_key: str = Argument(..., help="The API key to use to generate the tenant token"),
-    expires_at: datetime = Option(
+    expires_at: Optional[str] = Option(
         None, help="The time at which the the tenant token should expire. UTC time should be used."
     ),
     url: Optional[str] = URL_OPTION,
@@ -74,11 +136,13 @@ def generate_tenant_token(
     with console.status("Generating Tenant Token..."):
         client = create_client(url, master_key)
         try:
-            formatted_search_rules = json.loads(search_rules)
+            formatted_search_rules = json_loads(search_rules)
         except json.JSONDecodeError:
             formatted_search_rules = search_rules
         response = client.generate_tenant_token(
-            formatted_search_rules, api_key=api_key, expires_at=expires_at
+            formatted_search_rules,
+            api_key=api_key,
+            expires_at=parse_datetime(expires_at, "--expires-at"),
         )
         console.print(create_panel(response, title="Tenant Token"))
 
@@ -88,7 +152,7 @@ def create_key(
     description: Optional[str] = Option(None, help="Description of the key"),
     actions: Optional[List[str]] = Option(None, help="Actions the key can perform"),
     indexes: Optional[List[str]] = Option(None, help="Indexes for which the key has access"),
-    expires_at: Optional[datetime] = Option(
+    expires_at: Optional[str] = Option(
         None, help="The date the key should expire. If included the date should be in UTC time"
     ),
     url: Optional[str] = URL_OPTION,
@@ -96,18 +160,14 @@ def create_key(
     raw: bool = RAW_OPTION,
 ) -> None:
     """Create a new API key."""
-    if not description and not actions and not indexes and not expires_at:
-        console.print("No values included for creating the key", style="error")
-        sys.exit(1)
-
-    options = {
-        "description": description,
-        "actions": actions,
-        "indexes": indexes,
-        "expiresAt": expires_at.isoformat() if expires_at else None,
-    }
-    client = create_client(url, master_key)
-    with console.status("Creating key..."):
+    require_any_value(
+        description, actions, indexes, expires_at, message="No values included for creating the key"
+    )
+    expires = parse_datetime(expires_at, "--expires-at")
+
+    # expiresAt is required when creating a key, null means the key never expires.
+    options = {"expiresAt": None, **key_options(description, actions, indexes, expires)}
+    with client_status(url, master_key, "Creating key...") as client:
         response = client.create_key(options)
 
     print_panel_or_raw(raw, response, "Key")
@@ -121,8 +181,7 @@ def delete_key(
     raw: bool = RAW_OPTION,
 ) -> None:
     """Delete an API key."""
-    client = create_client(url, master_key)
-    with console.status("Deleting key..."):
+    with client_status(url, master_key, "Deleting key...") as client:
         response = client.delete_key(key)
 
     data = {"response": response.status_code}  # type: ignore
@@ -137,8 +196,7 @@ def get_key(
     raw: bool = RAW_OPTION,
 ) -> None:
     """Get an API key."""
-    client = create_client(url, master_key)
-    with console.status("Getting key..."):
+    with client_status(url, master_key, "Getting key...") as client:
         response = client.get_key(key)
 
     print_panel_or_raw(raw, response, "Key")
@@ -152,10 +210,10 @@ def get_keys(
 ) -> None:
     """Gets the public and private keys"""
 
-    client = create_client(url, master_key)
-    with console.status("Getting keys..."):
+    with client_status(url, master_key, "Getting keys...") as client:
         keys = client.get_keys()
-        print_panel_or_raw(raw, keys, "Keys")
+
+    print_panel_or_raw(raw, keys, "Keys")
 
 
 @app.command()
@@ -164,7 +222,7 @@ def update_key(
     description: Optional[str] = Option(None, help="Description of the key"),
     actions: Optional[List[str]] = Option(None, help="Actions the key can perform"),
     indexes: Optional[List[str]] = Option(None, help="Indexes for which the key has access"),
-    expires_at: Optional[datetime] = Option(
+    expires_at: Optional[str] = Option(
         None, help="The date the key should expire. If included the date should be in UTC time"
     ),
     url: Optional[str] = URL_OPTION,
@@ -172,19 +230,14 @@ def update_key(
     raw: bool = RAW_OPTION,
 ) -> None:
     """Update an API key."""
-    if not description and not actions and not indexes and not expires_at:
-        console.print("No values included for creating the key", style="error")
-        sys.exit(1)
-
-    options = {
-        "key": key,
-        "description": description,
-        "actions": actions,
-        "indexes": indexes,
-        "expiresAt": expires_at.isoformat() if expires_at else None,
-    }
-    client = create_client(url, master_key)
-    with console.status("Updating index..."):
+    require_any_value(
+        description, actions, indexes, expires_at, message="No values included for updating the key"
+    )
+    expires = parse_datetime(expires_at, "--expires-at")
+
+    # Only send the values that were provided so a null doesn't overwrite an existing value.
+    options = {"key": key, **key_options(description, actions, indexes, expires)}
+    with client_status(url, master_key, "Updating index...") as client:
         response = client.update_key(key, options)
 
     print_panel_or_raw(raw, response, "Key")
@@ -198,10 +251,10 @@ def get_version(
 ) -> None:
     """Gets the MeiliSearch version information."""
 
-    client = create_client(url, master_key)
-    with console.status("Getting version..."):
+    with client_status(url, master_key, "Getting version...") as client:
         version = client.get_version()
-        print_panel_or_raw(raw, version, "Version Information")
+
+    print_panel_or_raw(raw, version, "Version Information")
 
 
 @app.command()
@@ -218,10 +271,29 @@ def health(
         )
         sys.exit()
 
-    client = Client(url)
-    with console.status("Getting server status..."):
-        health = client.health()
-        print_panel_or_raw(raw, health, "Server Health")
+    # The health route doesn't need authentication so a single GET is enough, there is no need to
+    # build a full client.
+    with delayed_status("Getting server status..."):
+        try:
+            response = requests.get(f"{url.rstrip('/')}/health", timeout=2)
+            response.raise_for_status()
+        # Checked first since a connect timeout is also a ConnectionError
+        except requests.exceptions.Timeout as e:
+            raise MeiliSearchTimeoutError(str(e)) from e
+        except requests.exceptions.ConnectionError as e:
+            raise MeiliSearchCommunicationError(str(e)) from e
+        except requests.exceptions.HTTPError as e:
+            raise MeiliSearchApiError(str(e), response) from e
+
+    print_panel_or_raw(raw, response.json(), "Server Health")
+
+
+def version_callback(version: Optional[bool]) -> None:
+    # Runs while the options are parsed so the version is printed before any subcommand is
+    # resolved and imported.
+    if version:
+        echo(__version__)
+        raise Exit()
 
 
 @app.callback(invoke_without_command=True)
@@ -230,19 +302,26 @@ def main(
         None,
         "--version",
         "-v",
+        callback=version_callback,
         is_eager=True,
         help="Show the installed version",
     ),
 ) -> None:
-    if version:
-        echo(__version__)
-        raise Exit()
+    from rich.traceback import install
+
+    install()
 
 
 @app.command()
+@handle_index_not_found
 def search(
     index: str = Argument(..., help="The name of the index from which to retrieve the settings"),
     query: str = Argument(..., help="The query string"),
+    extra_queries: Optional[List[str]] = Option(
+        None,
+        "--query",
+        help="Another query string to search for. Can be repeated, all queries use the same options",
+    ),
     offset: Optional[int] = Option(None, help="The number of documents to skip"),
     limit: Optional[int] = Option(None, help="The maximum number of documents to return"),
     filter: Optional[List[str]] = Option(None, help="Filter queries by an attribute value"),
@@ -272,47 +351,69 @@ def search(
         None,
         help="Marker to display when the number of words excedes the `crop_length`.",
     ),
+    concurrency: int = Option(1, min=1, help="The number of queries to run at the same time"),
     url: Optional[str] = URL_OPTION,
     master_key: Optional[str] = MASTER_KEY_OPTION,
+    compact: bool = Option(
+        False,
+        help=f"Print the results as JSON instead of panels. This is always done when there are more than {_COMPACT_HITS_THRESHOLD} hits",
+    ),
     raw: bool = RAW_OPTION,
 ) -> None:
     """Perform a search."""
 
     client = create_client(url, master_key)
-    search_params: dict[str, Any] = {}
-
-    set_search_param(search_params, offset, "offset")
-    set_search_param(search_params, limit, "limit")
-    set_search_param(search_params, filter, "filter")
-    set_search_param(search_params, facets_distribution, "facetsDistribution")
-    set_search_param(search_params, attributes_to_retrieve, "attributesToRetrieve")
-    set_search_param(search_params, attributes_to_crop, "attributesToCrop")
-    set_search_param(search_params, crop_length, "cropLength")
-    set_search_param(search_params, attributes_to_hightlight, "attributesToHighlight")
-    set_search_param(search_params, matches, "matches")
-    set_search_param(search_params, sort, "sort")
-    set_search_param(search_params, highlight_pre_tag, "highlightPreTag")
-    set_search_param(search_params, highlight_post_tag, "highlightPostTag")
-    set_search_param(search_params, crop_marker, "cropMarker")
-
-    try:
-        with console.status("Searching..."):
-            if search_params:
-                search_results = client.index(index).search(query, search_params)
-            else:
-                search_results = client.index(index).search(query)
-
-            if raw:
-                console.print_json(json.dumps(search_results))
-            else:
-                hits_panel = create_panel(search_results["hits"], title="Hits", fit=False)
-                del search_results["hits"]
-                info_panel = create_panel(search_results, title="Information", fit=False)
-                panel_group = Group(info_panel, hits_panel)
-                panel = Panel(panel_group, title="Search Results", border_style=PANEL_BORDER_COLOR)
-                console.print(panel)
-    except MeiliSearchApiError as e:
-        handle_meilisearch_api_error(e, index)
+    search_values = (
+        offset,
+        limit,
+        filter,
+        facets_distribution,
+        attributes_to_retrieve,
+        attributes_to_crop,
+        crop_length,
+        attributes_to_hightlight,
+        matches,
+        sort,
+        highlight_pre_tag,
+        highlight_post_tag,
+        crop_marker,
+    )
+    search_params = {key: value for key, value in zip(_SEARCH_KEYS, search_values) if value}
+
+    client_index = client.index(index)
+    with delayed_status("Searching..."):
+        # Each query is a separate request so up to `concurrency` of them are sent at the same time.
+        # Repeated queries are only sent once.
+        queries = [query, *(extra_queries or [])]
+        unique_queries = list(dict.fromkeys(queries))
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(unique_queries))) as executor:
+            results = dict(
+                zip(
+                    unique_queries,
+                    executor.map(lambda q: client_index.search(q, search_params), unique_queries),
+                )
+            )
+
+    for q in queries:
+        # Copied since the hits are popped and the same result can be printed more than once
+        search_results = dict(results[q])
+        if raw:
+            print_raw_json(search_results)
+        elif compact or len(search_results["hits"]) > _COMPACT_HITS_THRESHOLD:
+            console.print(f'Query: "{q}"', markup=False)
+            console.print_json(data=search_results, default=str)
+        else:
+            hits = search_results.pop("hits")
+            console.print(
+                Panel(
+                    Group(
+                        create_panel(search_results, title="Information", fit=False),
+                        create_panel(hits, title="Hits", fit=False),
+                    ),
+                    title=f'Search Results for "{escape(q)}"',
+                    border_style=PANEL_BORDER_COLOR,
+                )
+            )
 
 
 if __name__ == "__main__":
@@ -1,9 +1,14 @@
 import csv
-import json
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
+from click.testing import CliRunner
+from meilisearch import task
 from meilisearch.client import Client
-from typer.testing import CliRunner
+from meilisearch.index import Index
+from typer.main import get_command
+
+from meilisearch_cli._helpers import json_dumps, json_loads
 
 
 @pytest.fixture(scope="session")
@@ -21,9 +26,35 @@ def master_key():
     return "masterKey"
 
 
-@pytest.fixture
+class CachedCliRunner(CliRunner):
+    """
+    Invokes Typer apps like typer.testing.CliRunner, but builds the click command for an app
+    once instead of on every invoke.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._commands = {}
+
+    def invoke(
+        self, cli, args=None, input=None, env=None, catch_exceptions=True, color=False, **extra
+    ):
+        if cli not in self._commands:
+            self._commands[cli] = get_command(cli)
+        return super().invoke(
+            self._commands[cli],
+            args=args,
+            input=input,
+            env=env,
+            catch_exceptions=catch_exceptions,
+            color=color,
+            **extra,
+        )
+
+
+@pytest.fixture(scope="session")
 def test_runner():
-    return CliRunner()
+    return CachedCliRunner()
 
 
 @pytest.fixture
@@ -35,6 +66,23 @@ def env_vars(monkeypatch, base_url, master_key):
     monkeypatch.delenv("MEILI_MASTER_KEY", raising=False)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def fast_wait_for_task():
+    """
+    Lowers the default poll interval of wait_for_task, for both the tests and the CLI.
+    Tasks on the local test server finish in a few milliseconds so most of the SDK's 50 ms
+    interval would be spent idle.
+    """
+
+    def wait_for_task(self, uid, timeout_in_ms=5000, interval_in_ms=5):
+        return task.wait_for_task(self.config, uid, timeout_in_ms, interval_in_ms)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(Client, "wait_for_task", wait_for_task)
+        monkeypatch.setattr(Index, "wait_for_task", wait_for_task)
+        yield
+
+
 @pytest.fixture(scope="session")
 def client(base_url, master_key):
     return Client(base_url, master_key)
@@ -50,8 +98,29 @@ def empty_index(client, index_uid):
     return index_maker
 
 
+@pytest.fixture(scope="session")
+def populated_index_uid():
+    return "populatedIndexUID"
+
+
+@pytest.fixture(scope="module")
+def populated_index(client, populated_index_uid, small_movies):
+    """
+    An index with the movies already added, shared by the read only tests in a module.
+    It is skipped by clear_indexes and deleted once the module is finished.
+    """
+    response = client.create_index(populated_index_uid)
+    client.wait_for_task(response["uid"])
+    index = client.get_index(populated_index_uid)
+    update = index.add_documents(small_movies)
+    index.wait_for_task(update["uid"])
+    yield index
+    response = index.delete()
+    client.wait_for_task(response["uid"])
+
+
 @pytest.fixture(autouse=True)
-def clear_indexes(client):
+def clear_indexes(client, populated_index_uid):
     """
     Auto-clears the indexes after each test function run.
     Makes all the test functions independent.
@@ -59,30 +128,39 @@ def clear_indexes(client):
     # Yields back to the test function.
     yield
     # Deletes all the indexes in the MeiliSearch instance.
-    indexes = client.get_indexes()
-    for index in indexes:
-        response = client.index(index.uid).delete()
+    indexes = [index for index in client.get_indexes() if index.uid != populated_index_uid]
+    if not indexes:
+        return
+
+    # Sends all the deletes before waiting so the requests aren't made one after the other.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda index: client.index(index.uid).delete(), indexes))
+    for response in responses:
         client.wait_for_task(response["uid"])
 
 
 @pytest.fixture(scope="session")
 def small_movies():
-    with open("./datasets/small_movies.json", "r", encoding="utf-8") as movie_file:
-        yield json.loads(movie_file.read())
+    with open("./datasets/small_movies.json", "rb") as movie_file:
+        yield json_loads(movie_file.read())
 
 
-@pytest.fixture
-def small_movies_json_path(small_movies, tmp_path):
-    file_path = tmp_path / "small_movies.json"
-    with open(file_path, "w") as f:
-        json.dump(small_movies, f)
+@pytest.fixture(scope="session")
+def small_movies_json(small_movies):
+    return json_dumps(small_movies)
+
+
+@pytest.fixture(scope="session")
+def small_movies_json_path(small_movies_json, tmp_path_factory):
+    file_path = tmp_path_factory.mktemp("datasets") / "small_movies.json"
+    file_path.write_text(small_movies_json, encoding="utf-8")
 
     return file_path
 
 
-@pytest.fixture
-def small_movies_csv_path(small_movies, tmp_path):
-    file_path = tmp_path / "small_movies.csv"
+@pytest.fixture(scope="session")
+def small_movies_csv_path(small_movies, tmp_path_factory):
+    file_path = tmp_path_factory.mktemp("datasets") / "small_movies.csv"
     with open(file_path, "w") as f:
         field_names = list(small_movies[0].keys())
         writer = csv.DictWriter(f, fieldnames=field_names, quoting=csv.QUOTE_MINIMAL)
@@ -92,13 +170,19 @@ def small_movies_csv_path(small_movies, tmp_path):
     return file_path
 
 
-@pytest.fixture
-def small_movies_ndjson_path(small_movies, tmp_path):
-    file_path = tmp_path / "small_movies.ndjson"
-    nd_json = [json.dumps(x) for x in small_movies]
-    with open(file_path, "w") as f:
-        for line in nd_json:
-            f.write(f"{line}\n")
+@pytest.fixture(scope="session")
+def small_movies_ndjson_path(small_movies, tmp_path_factory):
+    file_path = tmp_path_factory.mktemp("datasets") / "small_movies.ndjson"
+    nd_json = "\n".join(json_dumps(x) for x in small_movies)
+    file_path.write_text(f"{nd_json}\n", encoding="utf-8")
+
+    return file_path
+
+
+@pytest.fixture(scope="session")
+def bad_xml_path(tmp_path_factory):
+    file_path = tmp_path_factory.mktemp("invalid") / "bad.xml"
+    file_path.write_text("")
 
     return file_path
 
@@ -2,76 +2,61 @@ import json
 from unittest.mock import patch
 
 import pytest
+from meilisearch._httprequests import HttpRequests
 from meilisearch.errors import MeiliSearchApiError
 from meilisearch.index import Index
 from requests.models import Response
+from typer.main import get_command
 
+from meilisearch_cli.documents import app as documents_app
 from meilisearch_cli.main import app
-from tests.utils import get_update_id_from_output
+from tests.utils import get_update_id_from_output, wait_for_all_tasks, wait_quick
 
 
+@pytest.mark.usefixtures("env_vars")
 @pytest.mark.parametrize(
     "primary_key, expected_primary_key", [(None, "id"), ("release_date", "release_date")]
 )
-@pytest.mark.parametrize("use_env", [True, False])
 def test_add_documents_no_wait(
-    use_env,
-    primary_key,
-    expected_primary_key,
-    index_uid,
-    base_url,
-    master_key,
-    test_runner,
-    small_movies,
-    monkeypatch,
-    client,
+    primary_key, expected_primary_key, index_uid, test_runner, small_movies_json, client
 ):
-    args = ["documents", "add", index_uid, json.dumps(small_movies)]
+    args = ["documents", "add", index_uid, small_movies_json]
 
     if primary_key:
         args.append("--primary-key")
         args.append(primary_key)
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
-
     runner_result = test_runner.invoke(app, args, catch_exceptions=False)
     out = runner_result.stdout
 
-    client.index(index_uid).wait_for_task(get_update_id_from_output(out))
+    wait_quick(client.index(index_uid), get_update_id_from_output(out))
 
     assert client.index(index_uid).get_primary_key() == expected_primary_key
     assert "uid" in out
 
 
-@pytest.mark.parametrize("wait_flag", ["--wait", "-w"])
-@pytest.mark.parametrize("use_env", [True, False])
-def test_add_documents(
-    use_env,
-    wait_flag,
-    index_uid,
-    base_url,
-    master_key,
-    test_runner,
-    small_movies,
-    monkeypatch,
-):
-    args = ["documents", "add", index_uid, json.dumps(small_movies), wait_flag]
+@pytest.mark.usefixtures("env_vars")
+def test_add_documents(index_uid, test_runner, small_movies_json):
+    args = ["documents", "add", index_uid, small_movies_json, "--wait"]
+
+    runner_result = test_runner.invoke(app, args, catch_exceptions=False)
+    out = runner_result.stdout
+
+    assert "title" in out
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+
+def test_add_documents_cli_flags(index_uid, base_url, master_key, test_runner, small_movies_json):
+    args = [
+        "documents",
+        "add",
+        index_uid,
+        small_movies_json,
+        "--wait",
+        "--url",
+        base_url,
+        "--master-key",
+        master_key,
+    ]
 
     runner_result = test_runner.invoke(app, args, catch_exceptions=False)
     out = runner_result.stdout
@@ -79,6 +64,39 @@ def test_add_documents(
     assert "title" in out
 
 
+@pytest.mark.parametrize("wait_flag", ["--wait", "-w"])
+def test_wait_flag_aliases(wait_flag, index_uid):
+    add = get_command(documents_app).get_command(None, "add")  # type: ignore
+    context = add.make_context("add", [index_uid, "[]", wait_flag])
+
+    assert context.params["wait"] is True
+
+
+@pytest.mark.usefixtures("env_vars")
+def test_batch_size_larger_than_dataset(
+    index_uid, test_runner, small_movies, small_movies_json, empty_index
+):
+    index = empty_index()
+    task_uids_before = {task["uid"] for task in index.get_tasks()["results"]}
+    args = [
+        "documents",
+        "add-in-batches",
+        index_uid,
+        small_movies_json,
+        "--batch-size",
+        "1000",
+        "--wait",
+    ]
+
+    test_runner.invoke(app, args, catch_exceptions=False)
+
+    new_tasks = [
+        task for task in index.get_tasks()["results"] if task["uid"] not in task_uids_before
+    ]
+    assert [task["type"] for task in new_tasks] == ["documentAddition"]
+    assert index.get_stats()["numberOfDocuments"] == len(small_movies)
+
+
 def test_add_documents_no_url_master_key(index_uid, test_runner):
     runner_result = test_runner.invoke(app, ["documents", "add", index_uid, '{"test": "test"}'])
     out = runner_result.stdout
@@ -100,21 +118,26 @@ def test_add_documents_json_error(
     assert "Unable to parse" in out
 
 
+@pytest.mark.usefixtures("env_vars")
+def test_add_documents_ndjson(index_uid, test_runner, small_movies, empty_index):
+    index = empty_index()
+    documents = "\n".join(json.dumps(x) for x in small_movies)
+
+    runner_result = test_runner.invoke(
+        app, ["documents", "add", index_uid, documents, "--wait"], catch_exceptions=False
+    )
+    out = runner_result.stdout
+
+    assert "title" in out
+    assert index.get_stats()["numberOfDocuments"] == len(small_movies)
+
+
+@pytest.mark.usefixtures("env_vars")
 @pytest.mark.parametrize(
     "primary_key, expected_primary_key", [(None, "id"), ("release_date", "release_date")]
 )
-@pytest.mark.parametrize("use_env", [True, False])
 def test_add_documents_from_file_json_no_wait(
-    use_env,
-    primary_key,
-    expected_primary_key,
-    index_uid,
-    base_url,
-    master_key,
-    test_runner,
-    monkeypatch,
-    client,
-    small_movies_json_path,
+    primary_key, expected_primary_key, index_uid, test_runner, client, small_movies_json_path
 ):
     args = ["documents", "add-from-file", index_uid, str(small_movies_json_path)]
 
@@ -122,46 +145,18 @@ def test_add_documents_from_file_json_no_wait(
         args.append("--primary-key")
         args.append(primary_key)
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
-
     runner_result = test_runner.invoke(app, args, catch_exceptions=False)
     out = runner_result.stdout
 
-    client.index(index_uid).wait_for_task(get_update_id_from_output(out))
+    wait_quick(client.index(index_uid), get_update_id_from_output(out))
 
     assert client.index(index_uid).get_primary_key() == expected_primary_key
     assert "uid" in out
 
 
-@pytest.mark.parametrize("wait_flag", ["--wait", "-w"])
-@pytest.mark.parametrize("use_env", [True, False])
-def test_add_documents_from_file_json_wait(
-    use_env,
-    wait_flag,
-    index_uid,
-    base_url,
-    master_key,
-    test_runner,
-    monkeypatch,
-    small_movies_json_path,
-):
-    args = ["documents", "add-from-file", index_uid, str(small_movies_json_path), wait_flag]
-
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+@pytest.mark.usefixtures("env_vars")
+def test_add_documents_from_file_json_wait(index_uid, test_runner, small_movies_json_path):
+    args = ["documents", "add-from-file", index_uid, str(small_movies_json_path), "--wait"]
 
     runner_result = test_runner.invoke(app, args, catch_exceptions=False)
     out = runner_result.stdout
@@ -181,7 +176,7 @@ def test_add_documents_from_file_csv(
     runner_result = test_runner.invoke(app, args)
     out = runner_result.stdout
 
-    client.index(index_uid).wait_for_task(get_update_id_from_output(out))
+    wait_quick(client.index(index_uid), get_update_id_from_output(out))
 
     assert "uid" in out
 
@@ -198,11 +193,34 @@ def test_add_documents_from_file_ndjson(
     runner_result = test_runner.invoke(app, args)
     out = runner_result.stdout
 
-    client.index(index_uid).wait_for_task(get_update_id_from_output(out))
+    wait_quick(client.index(index_uid), get_update_id_from_output(out))
 
     assert "uid" in out
 
 
+@pytest.mark.usefixtures("env_vars")
+@pytest.mark.parametrize("file_path_fixture", ["small_movies_csv_path", "small_movies_ndjson_path"])
+def test_add_documents_from_file_chunk_size(
+    file_path_fixture, index_uid, test_runner, client, small_movies, request
+):
+    file_path = request.getfixturevalue(file_path_fixture)
+    args = [
+        "documents",
+        "add-from-file",
+        index_uid,
+        str(file_path),
+        "--chunk-size",
+        "1000",
+        "--wait",
+    ]
+
+    runner_result = test_runner.invoke(app, args)
+    out = runner_result.stdout
+
+    assert "title" in out
+    assert client.index(index_uid).get_stats()["numberOfDocuments"] == len(small_movies)
+
+
 def test_add_documents_from_file_no_url_master_key(index_uid, test_runner, small_movies_json_path):
     runner_result = test_runner.invoke(
         app, ["documents", "add-from-file", index_uid, str(small_movies_json_path)]
@@ -224,39 +242,31 @@ def test_add_documents_from_file_bad_path(index_uid, test_runner, tmp_path):
 
 
 @pytest.mark.usefixtures("env_vars")
-def test_add_documents_from_file_invalid_type(index_uid, test_runner, tmp_path):
-    file_path = tmp_path / "bad.xml"
-    with open(file_path, "w") as f:
-        f.write("")
-
+def test_add_documents_from_file_invalid_type(index_uid, test_runner, bad_xml_path):
     runner_result = test_runner.invoke(
-        app, ["documents", "add-from-file", index_uid, str(file_path)]
+        app, ["documents", "add-from-file", index_uid, str(bad_xml_path)]
     )
     out = runner_result.stdout
     assert "not accepted" in out
 
 
+@pytest.mark.usefixtures("env_vars")
 @pytest.mark.parametrize(
     "primary_key, expected_primary_key", [(None, "id"), ("release_date", "release_date")]
 )
-@pytest.mark.parametrize("batch_size", [None, 10, 1000])
-@pytest.mark.parametrize("use_env", [True, False])
+@pytest.mark.parametrize("batch_size", [None, 10])
 def test_add_documents_in_batches_no_wait(
-    use_env,
     primary_key,
     expected_primary_key,
     batch_size,
     index_uid,
-    base_url,
-    master_key,
     test_runner,
-    small_movies,
-    monkeypatch,
+    small_movies_json,
     empty_index,
 ):
     index = empty_index()
 
-    args = ["documents", "add-in-batches", index_uid, json.dumps(small_movies)]
+    args = ["documents", "add-in-batches", index_uid, small_movies_json]
 
     if batch_size:
         args.append("--batch-size")
@@ -266,64 +276,58 @@ def test_add_documents_in_batches_no_wait(
         args.append("--primary-key")
         args.append(primary_key)
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
-
     runner_result = test_runner.invoke(app, args, catch_exceptions=False)
     out = runner_result.stdout
 
-    for task in index.get_tasks()["results"]:
-        index.wait_for_task(task["uid"])
+    wait_for_all_tasks(index)
 
     assert index.get_primary_key() == expected_primary_key
     assert "uid" in out
 
 
-@pytest.mark.parametrize("wait_flag", ["--wait", "-w"])
-@pytest.mark.parametrize("batch_size", [None, 10, 1000])
-@pytest.mark.parametrize("use_env", [True, False])
+@pytest.mark.usefixtures("env_vars")
+@pytest.mark.parametrize("batch_size", [None, 10])
 def test_add_documents_in_batches(
-    use_env,
-    wait_flag,
-    batch_size,
-    index_uid,
-    base_url,
-    master_key,
-    test_runner,
-    small_movies,
-    monkeypatch,
-    empty_index,
+    batch_size, index_uid, test_runner, small_movies, small_movies_json, empty_index
 ):
     index = empty_index()
 
-    args = ["documents", "add-in-batches", index_uid, json.dumps(small_movies), wait_flag]
+    args = ["documents", "add-in-batches", index_uid, small_movies_json, "--wait"]
 
     if batch_size:
         args.append("--batch-size")
         args.append(str(batch_size))
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
-
     runner_result = test_runner.invoke(app, args, catch_exceptions=False)
     out = runner_result.stdout
 
-    for task in index.get_tasks()["results"]:
-        index.wait_for_task(task["uid"])
+    assert "title" in out
+    assert index.get_stats()["numberOfDocuments"] == len(small_movies)
+
+
+@pytest.mark.usefixtures("env_vars")
+def test_add_documents_in_batches_concurrency(
+    index_uid, test_runner, small_movies, small_movies_json, empty_index
+):
+    index = empty_index()
+
+    args = [
+        "documents",
+        "add-in-batches",
+        index_uid,
+        small_movies_json,
+        "--batch-size",
+        "5",
+        "--concurrency",
+        "4",
+        "--wait",
+    ]
+
+    runner_result = test_runner.invoke(app, args, catch_exceptions=False)
+    out = runner_result.stdout
 
     assert "title" in out
+    assert index.get_stats()["numberOfDocuments"] == len(small_movies)
 
 
 def test_add_documents_in_batches_no_url_master_key(index_uid, test_runner):
@@ -349,47 +353,28 @@ def test_add_documents_in_batches_json_error(
     assert "Unable to parse" in out
 
 
+@pytest.mark.usefixtures("env_vars")
 @pytest.mark.parametrize(
     "wait_flag, expected",
-    [(None, "uid"), ("--wait", "[]"), ("-w", "[]")],
+    [(None, "uid"), ("--wait", "[]")],
 )
-@pytest.mark.parametrize("use_env", [True, False])
-def test_delete_all_documents(
-    use_env,
-    wait_flag,
-    expected,
-    index_uid,
-    base_url,
-    master_key,
-    test_runner,
-    small_movies,
-    monkeypatch,
-    client,
-):
-    update = client.index(index_uid).add_documents(small_movies)
-    client.index(index_uid).wait_for_task(update["uid"])
+def test_delete_all_documents(wait_flag, expected, index_uid, test_runner, small_movies, client):
+    index = client.index(index_uid)
+    update = index.add_documents(small_movies)
+    index.wait_for_task(update["uid"])
 
     args = ["documents", "delete-all", index_uid]
 
     if wait_flag:
         args.append(wait_flag)
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
-
     runner_result = test_runner.invoke(app, args)
     out = runner_result.stdout
 
     if not wait_flag:
-        client.index(index_uid).wait_for_task(get_update_id_from_output(out))
+        wait_quick(index, get_update_id_from_output(out))
 
-    assert client.index(index_uid).get_documents() == []
+    assert index.get_documents() == []
     assert expected in out
 
 
@@ -401,26 +386,16 @@ def test_delete_all_documents_no_url_master_key(index_uid, test_runner):
     assert "MEILI_MASTER_KEY" in out
 
 
+@pytest.mark.usefixtures("env_vars")
 @pytest.mark.parametrize(
     "wait_flag, expected",
-    [(None, "uid"), ("--wait", "title"), ("-w", "title")],
+    [(None, "uid"), ("--wait", "title")],
 )
-@pytest.mark.parametrize("use_env", [True, False])
-def test_delete_document(
-    use_env,
-    wait_flag,
-    expected,
-    index_uid,
-    base_url,
-    master_key,
-    test_runner,
-    small_movies,
-    monkeypatch,
-    client,
-):
-    update = client.index(index_uid).add_documents(small_movies)
-    client.index(index_uid).wait_for_task(update["uid"])
-    documents = client.index(index_uid).get_documents()
+def test_delete_document(wait_flag, expected, index_uid, test_runner, small_movies, client):
+    index = client.index(index_uid)
+    update = index.add_documents(small_movies)
+    index.wait_for_task(update["uid"])
+    documents = index.get_documents()
     document_id = documents[0]["id"]
 
     args = ["documents", "delete", index_uid, document_id]
@@ -428,23 +403,14 @@ def test_delete_document(
     if wait_flag:
         args.append(wait_flag)
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
-
     runner_result = test_runner.invoke(app, args)
     out = runner_result.stdout
 
     if not wait_flag:
-        client.index(index_uid).wait_for_task(get_update_id_from_output(out))
+        wait_quick(index, get_update_id_from_output(out))
 
     with pytest.raises(MeiliSearchApiError):
-        client.index(index_uid).get_document(document_id)
+        index.get_document(document_id)
 
     assert expected in out
 
@@ -457,26 +423,16 @@ def test_delete_document_no_url_master_key(index_uid, test_runner):
     assert "MEILI_MASTER_KEY" in out
 
 
+@pytest.mark.usefixtures("env_vars")
 @pytest.mark.parametrize(
     "wait_flag, expected",
-    [(None, "uid"), ("--wait", "title"), ("-w", "title")],
+    [(None, "uid"), ("--wait", "title")],
 )
-@pytest.mark.parametrize("use_env", [True, False])
-def test_delete_documents(
-    use_env,
-    wait_flag,
-    expected,
-    index_uid,
-    base_url,
-    master_key,
-    test_runner,
-    small_movies,
-    monkeypatch,
-    client,
-):
-    update = client.index(index_uid).add_documents(small_movies)
-    client.index(index_uid).wait_for_task(update["uid"])
-    documents = client.index(index_uid).get_documents()
+def test_delete_documents(wait_flag, expected, index_uid, test_runner, small_movies, client):
+    index = client.index(index_uid)
+    update = index.add_documents(small_movies)
+    index.wait_for_task(update["uid"])
+    documents = index.get_documents()
     document_id_1 = documents[0]["id"]
     document_id_2 = documents[1]["id"]
 
@@ -485,24 +441,15 @@ def test_delete_documents(
     if wait_flag:
         args.append(wait_flag)
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
-
     runner_result = test_runner.invoke(app, args)
     out = runner_result.stdout
 
     if not wait_flag:
-        client.index(index_uid).wait_for_task(get_update_id_from_output(out))
+        wait_quick(index, get_update_id_from_output(out))
 
     for document_id in [document_id_1, document_id_2]:
         with pytest.raises(MeiliSearchApiError):
-            client.index(index_uid).get_document(document_id)
+            index.get_document(document_id)
 
     assert expected in out
 
@@ -515,22 +462,11 @@ def test_delete_documents_no_url_master_key(index_uid, test_runner):
     assert "MEILI_MASTER_KEY" in out
 
 
-@pytest.mark.parametrize("use_env", [True, False])
+@pytest.mark.usefixtures("env_vars")
 @pytest.mark.parametrize("raw", [True, False])
-def test_get_all_update_status(
-    use_env, raw, index_uid, base_url, master_key, test_runner, client, small_movies, monkeypatch
-):
+def test_get_all_update_status(raw, index_uid, test_runner, client, small_movies):
     args = ["index", "get-tasks", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
-
     if raw:
         args.append("--raw")
 
@@ -538,7 +474,8 @@ def test_get_all_update_status(
     client.wait_for_task(response["uid"])
     client_index = client.get_index(index_uid)
     client_index.add_documents(small_movies)
-    client_index.add_documents(small_movies)
+    # A settings update is enough for the third task, it doesn't need to index the movies again
+    client_index.update_searchable_attributes(["title"])
     runner_result = test_runner.invoke(app, args, catch_exceptions=False)
 
     assert len(client_index.get_tasks()["results"]) == 3
@@ -577,28 +514,12 @@ def test_get_all_update_status_error(mock_get, test_runner, index_uid):
         test_runner.invoke(app, ["index", "get-tasks", index_uid], catch_exceptions=False)
 
 
-@pytest.mark.parametrize("use_env", [True, False])
+@pytest.mark.usefixtures("env_vars")
 @pytest.mark.parametrize("raw", [True, False])
-def test_get_document(
-    use_env, raw, index_uid, base_url, master_key, test_runner, client, small_movies, monkeypatch
-):
-    response = client.create_index(index_uid)
-    client.wait_for_task(response["uid"])
-    client_index = client.get_index(index_uid)
-    update = client_index.add_documents(small_movies)
-    client_index.wait_for_task(update["uid"])
-    documents = client_index.get_documents()
+def test_get_document(raw, test_runner, populated_index):
+    documents = populated_index.get_documents()
 
-    args = ["documents", "get", index_uid, documents[0]["id"]]
-
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args = ["documents", "get", populated_index.uid, documents[0]["id"]]
 
     if raw:
         args.append("--raw")
@@ -635,27 +556,10 @@ def test_get_document_error(mock_get, test_runner, index_uid):
         test_runner.invoke(app, ["documents", "get", index_uid, "test"], catch_exceptions=False)
 
 
-@pytest.mark.parametrize("use_env", [True, False])
+@pytest.mark.usefixtures("env_vars")
 @pytest.mark.parametrize("raw", [True, False])
-def test_get_documents(
-    use_env, raw, index_uid, base_url, master_key, test_runner, client, small_movies, monkeypatch
-):
-    response = client.create_index(index_uid)
-    client.wait_for_task(response["uid"])
-    client_index = client.get_index(index_uid)
-    update = client_index.add_documents(small_movies)
-    client_index.wait_for_task(update["uid"])
-
-    args = ["documents", "get-all", index_uid]
-
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+def test_get_documents(raw, test_runner, populated_index):
+    args = ["documents", "get-all", populated_index.uid]
 
     if raw:
         args.append("--raw")
@@ -696,44 +600,28 @@ def test_get_documents_error(mock_get, test_runner, index_uid):
         test_runner.invoke(app, ["documents", "get-all", index_uid], catch_exceptions=False)
 
 
+@pytest.mark.usefixtures("env_vars")
 @pytest.mark.parametrize("raw", [True, False])
-@pytest.mark.parametrize("use_env", [True, False])
 def test_update_documents_no_wait(
-    use_env,
-    raw,
-    index_uid,
-    base_url,
-    master_key,
-    test_runner,
-    small_movies,
-    monkeypatch,
-    client,
+    raw, index_uid, test_runner, small_movies, small_movies_json, client
 ):
-    args = ["documents", "update", index_uid, json.dumps(small_movies)]
-
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    index = client.index(index_uid)
+    args = ["documents", "update", index_uid, small_movies_json]
 
     if raw:
         args.append("--raw")
 
-    update = client.index(index_uid).add_documents(small_movies)
-    client.index(index_uid).wait_for_task(update["uid"])
-    documents = client.index(index_uid).get_documents()
+    update = index.add_documents(small_movies)
+    index.wait_for_task(update["uid"])
+    documents = index.get_documents()
     documents[0]["title"] = "some title"
-    update = client.index(index_uid).update_documents([documents[0]])
-    client.index(index_uid).wait_for_task(update["uid"])
+    update = index.update_documents([documents[0]])
+    index.wait_for_task(update["uid"])
 
     runner_result = test_runner.invoke(app, args)
     out = runner_result.stdout
 
-    client.index(index_uid).wait_for_task(get_update_id_from_output(out))
+    wait_quick(index, get_update_id_from_output(out))
 
     assert "uid" in out
 
@@ -742,24 +630,18 @@ def test_update_documents_no_wait(
         assert "}" in out
 
 
-@pytest.mark.parametrize("wait_flag", ["--wait", "-w"])
 @pytest.mark.usefixtures("env_vars")
-def test_update_documents_wait(
-    wait_flag,
-    index_uid,
-    test_runner,
-    small_movies,
-    client,
-):
+def test_update_documents_wait(index_uid, test_runner, small_movies, small_movies_json, client):
+    index = client.index(index_uid)
     updated_title = "some title"
-    args = ["documents", "update", index_uid, json.dumps(small_movies), wait_flag]
+    args = ["documents", "update", index_uid, small_movies_json, "--wait"]
 
-    update = client.index(index_uid).add_documents(small_movies)
-    client.index(index_uid).wait_for_task(update["uid"])
-    documents = client.index(index_uid).get_documents()
+    update = index.add_documents(small_movies)
+    index.wait_for_task(update["uid"])
+    documents = index.get_documents()
     documents[0]["title"] = updated_title
-    update = client.index(index_uid).update_documents([documents[0]])
-    client.index(index_uid).wait_for_task(update["uid"])
+    update = index.update_documents([documents[0]])
+    index.wait_for_task(update["uid"])
 
     runner_result = test_runner.invoke(app, args)
     out = runner_result.stdout
@@ -767,6 +649,24 @@ def test_update_documents_wait(
     assert updated_title not in out
 
 
+@pytest.mark.usefixtures("env_vars")
+@pytest.mark.parametrize(
+    "primary_key, expected", [(None, ""), ("movie id", "?primaryKey=movie+id")]
+)
+@patch.object(HttpRequests, "put")
+def test_update_documents_primary_key_route(
+    mock_put, primary_key, expected, index_uid, test_runner
+):
+    mock_put.return_value = {"uid": 1}
+    args = ["documents", "update", index_uid, '[{"id": 1}]']
+    if primary_key is not None:
+        args += ["--primary-key", primary_key]
+
+    test_runner.invoke(app, args, catch_exceptions=False)
+
+    assert mock_put.call_args[0][0] == f"indexes/{index_uid}/documents{expected}"
+
+
 def test_update_documents_no_url_master_key(index_uid, test_runner):
     runner_result = test_runner.invoke(app, ["documents", "update", index_uid, '{"test": "test"}'])
     out = runner_result.stdout
@@ -788,37 +688,20 @@ def test_update_documents_json_error(
     assert "Unable to parse" in out
 
 
+@pytest.mark.usefixtures("env_vars")
 @pytest.mark.parametrize("raw", [True, False])
-@pytest.mark.parametrize("use_env", [True, False])
 def test_update_documents_from_file_json_no_wait(
-    use_env,
-    raw,
-    index_uid,
-    base_url,
-    master_key,
-    test_runner,
-    monkeypatch,
-    client,
-    small_movies_json_path,
+    raw, index_uid, test_runner, client, small_movies_json_path
 ):
     args = ["documents", "update-from-file", index_uid, str(small_movies_json_path)]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
-
     if raw:
         args.append("--raw")
 
     runner_result = test_runner.invoke(app, args)
     out = runner_result.stdout
 
-    client.index(index_uid).wait_for_task(get_update_id_from_output(out))
+    wait_quick(client.index(index_uid), get_update_id_from_output(out))
 
     assert "uid" in out
 
@@ -827,15 +710,9 @@ def test_update_documents_from_file_json_no_wait(
         assert "}" in out
 
 
-@pytest.mark.parametrize("wait_flag", ["--wait", "-w"])
 @pytest.mark.usefixtures("env_vars")
-def test_update_documents_from_file_json_wait(
-    wait_flag,
-    index_uid,
-    test_runner,
-    small_movies_json_path,
-):
-    args = ["documents", "update-from-file", index_uid, str(small_movies_json_path), wait_flag]
+def test_update_documents_from_file_json_wait(index_uid, test_runner, small_movies_json_path):
+    args = ["documents", "update-from-file", index_uid, str(small_movies_json_path), "--wait"]
 
     runner_result = test_runner.invoke(app, args)
     out = runner_result.stdout
@@ -855,7 +732,7 @@ def test_update_documents_from_file_csv(
     runner_result = test_runner.invoke(app, args)
     out = runner_result.stdout
 
-    client.index(index_uid).wait_for_task(get_update_id_from_output(out))
+    wait_quick(client.index(index_uid), get_update_id_from_output(out))
 
     assert "uid" in out
 
@@ -872,11 +749,34 @@ def test_update_documents_from_file_ndjson(
     runner_result = test_runner.invoke(app, args)
     out = runner_result.stdout
 
-    client.index(index_uid).wait_for_task(get_update_id_from_output(out))
+    wait_quick(client.index(index_uid), get_update_id_from_output(out))
 
     assert "uid" in out
 
 
+@pytest.mark.usefixtures("env_vars")
+@pytest.mark.parametrize("file_path_fixture", ["small_movies_csv_path", "small_movies_ndjson_path"])
+def test_update_documents_from_file_chunk_size(
+    file_path_fixture, index_uid, test_runner, client, small_movies, request
+):
+    file_path = request.getfixturevalue(file_path_fixture)
+    args = [
+        "documents",
+        "update-from-file",
+        index_uid,
+        str(file_path),
+        "--chunk-size",
+        "1000",
+        "--wait",
+    ]
+
+    runner_result = test_runner.invoke(app, args)
+    out = runner_result.stdout
+
+    assert "title" in out
+    assert client.index(index_uid).get_stats()["numberOfDocuments"] == len(small_movies)
+
+
 def test_update_documents_from_file_no_url_master_key(
     index_uid, test_runner, small_movies_json_path
 ):
@@ -900,56 +800,59 @@ def test_update_documents_from_file_bad_path(index_uid, test_runner, tmp_path):
 
 
 @pytest.mark.usefixtures("env_vars")
-def test_update_documents_from_file_invalid_type(index_uid, test_runner, tmp_path):
-    file_path = tmp_path / "bad.xml"
-    with open(file_path, "w") as f:
-        f.write("")
-
+def test_update_documents_from_file_invalid_type(index_uid, test_runner, bad_xml_path):
     runner_result = test_runner.invoke(
-        app, ["documents", "update-from-file", index_uid, str(file_path)]
+        app, ["documents", "update-from-file", index_uid, str(bad_xml_path)]
     )
     out = runner_result.stdout
     assert "not accepted" in out
 
 
-@pytest.mark.parametrize("batch_size", [None, 10, 1000])
-@pytest.mark.parametrize("use_env", [True, False])
+@pytest.mark.usefixtures("env_vars")
+def test_update_documents_in_batches_concurrency(
+    index_uid, test_runner, small_movies, small_movies_json, empty_index
+):
+    index = empty_index()
+
+    args = [
+        "documents",
+        "update-in-batches",
+        index_uid,
+        small_movies_json,
+        "--batch-size",
+        "5",
+        "--concurrency",
+        "4",
+        "--wait",
+    ]
+
+    runner_result = test_runner.invoke(app, args, catch_exceptions=False)
+    out = runner_result.stdout
+
+    assert "title" in out
+    assert index.get_stats()["numberOfDocuments"] == len(small_movies)
+
+
+@pytest.mark.usefixtures("env_vars")
+@pytest.mark.parametrize("batch_size", [None, 10])
 @pytest.mark.parametrize("raw", [True, False])
 def test_update_documents_in_batches_no_wait(
-    use_env,
-    raw,
-    batch_size,
-    index_uid,
-    base_url,
-    master_key,
-    test_runner,
-    small_movies,
-    monkeypatch,
-    client,
+    raw, batch_size, index_uid, test_runner, small_movies_json, client
 ):
-    args = ["documents", "update-in-batches", index_uid, json.dumps(small_movies)]
+    args = ["documents", "update-in-batches", index_uid, small_movies_json]
 
     if batch_size:
         args.append("--batch-size")
         args.append(str(batch_size))
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
-
     if raw:
         args.append("--raw")
 
     runner_result = test_runner.invoke(app, args, catch_exceptions=False)
     out = runner_result.stdout
 
-    for update_id in get_update_id_from_output(out):
-        client.index(index_uid).wait_for_task(update_id)
+    # Tasks on an index are processed in order so once the newest one is done they all are
+    wait_quick(client.index(index_uid), max(get_update_id_from_output(out)))
 
     assert "uid" in out
 
@@ -958,15 +861,9 @@ def test_update_documents_in_batches_no_wait(
         assert "}" in out
 
 
-@pytest.mark.parametrize("wait_flag", ["--wait", "-w"])
 @pytest.mark.usefixtures("env_vars")
-def test_update_documents_in_batches_wait(
-    wait_flag,
-    index_uid,
-    test_runner,
-    small_movies,
-):
-    args = ["documents", "update-in-batches", index_uid, json.dumps(small_movies), wait_flag]
+def test_update_documents_in_batches_wait(index_uid, test_runner, small_movies_json):
+    args = ["documents", "update-in-batches", index_uid, small_movies_json, "--wait"]
 
     runner_result = test_runner.invoke(app, args, catch_exceptions=False)
     out = runner_result.stdout
@@ -6,6 +6,7 @@ from time import sleep
 import pytest
 
 from meilisearch_cli.main import app
+from tests.utils import creds_argv
 
 
 def wait_for_dump_creation(client, dump_uid, timeout_in_ms=10000, interval_in_ms=500):
@@ -26,14 +27,7 @@ def wait_for_dump_creation(client, dump_uid, timeout_in_ms=10000, interval_in_ms
 def test_create_dump(use_env, raw, client, test_runner, base_url, master_key, monkeypatch):
     args = ["dump", "create"]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
@@ -72,14 +66,7 @@ def test_get_dump_status(use_env, raw, test_runner, base_url, master_key, client
     response = client.create_dump()
     args = ["dump", "get-status", response["uid"]]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
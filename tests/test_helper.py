@@ -1,13 +1,32 @@
 import json
+from datetime import datetime
+from time import sleep
 from unittest.mock import patch
 
 import pytest
 import requests
 from meilisearch.errors import MeiliSearchError
 from meilisearch.index import Index
+from typer import BadParameter
 
+from meilisearch_cli import _helpers
 from meilisearch_cli._config import console
-from meilisearch_cli._helpers import check_index_status, create_panel
+from meilisearch_cli._helpers import (
+    check_index_status,
+    create_client,
+    create_panel,
+    delayed_status,
+    is_ndjson,
+    json_dumps,
+    json_loads,
+    key_options,
+    parse_datetime,
+    print_json_parse_error_message,
+    print_raw_json,
+    read_documents_file,
+    send_documents_in_batches,
+    split_documents,
+)
 from meilisearch_cli.main import app
 
 
@@ -23,6 +42,183 @@ def test_create_panel(fit, capfd):
     assert title in out
 
 
+def test_create_client_cached(base_url, master_key):
+    assert create_client(base_url, master_key) is create_client(base_url, master_key)
+
+
+@pytest.mark.parametrize(
+    "documents, expected",
+    [
+        ('{"id": 1}\n{"id": 2}', True),
+        ('  {"id": 1}\n{"id": 2}\n', True),
+        ('[{"id": 1}, {"id": 2}]', False),
+        ('{"id": 1}', False),
+    ],
+)
+def test_is_ndjson(documents, expected):
+    assert is_ndjson(documents) is expected
+
+
+def test_delayed_status_fast(capfd):
+    with delayed_status("Testing..."):
+        pass
+
+    out, _ = capfd.readouterr()
+    assert "Testing..." not in out
+
+
+def test_delayed_status_slow(capfd):
+    with delayed_status("Testing...", delay=0):
+        sleep(0.2)
+        assert console._live is not None
+
+    assert console._live is None
+    console.print("done")
+    out, _ = capfd.readouterr()
+    assert out.endswith("done\n")
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "json"])
+def use_orjson(request, monkeypatch):
+    # orjson is optional so both the orjson and the standard library paths are tested
+    if request.param:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(_helpers, "orjson", None)
+
+
+@pytest.mark.usefixtures("use_orjson")
+def test_json_dumps():
+    data = {"id": 1, "name": "test", "createdAt": datetime(2022, 1, 1)}
+    result = json.loads(json_dumps(data))
+    assert result["id"] == 1
+    assert result["name"] == "test"
+    assert result["createdAt"].startswith("2022-01-01")
+
+
+def test_key_options():
+    result = key_options("test", None, ["movies"], datetime(2023, 1, 1))
+    assert result == {
+        "description": "test",
+        "indexes": ["movies"],
+        "expiresAt": "2023-01-01T00:00:00",
+    }
+
+
+def test_print_raw_json_not_terminal(capsys):
+    print_raw_json({"id": 1, "name": "test"})
+    out = capsys.readouterr().out
+
+    assert out.count("\n") == 1
+    assert json.loads(out) == {"id": 1, "name": "test"}
+
+
+def test_print_raw_json_terminal(monkeypatch, capsys):
+    monkeypatch.setattr(console, "_force_terminal", True)
+    print_raw_json({"id": 1, "created": datetime(2022, 1, 1)})
+    out = capsys.readouterr().out
+
+    assert out.count("\n") > 1
+    assert "2022-01-01 00:00:00" in out
+
+
+def test_print_json_parse_error_message_truncates(capsys):
+    print_json_parse_error_message("a" * 1000)
+    out = capsys.readouterr().out.replace("\n", "")
+
+    assert "a" * 200 + "..." in out
+    assert "a" * 201 not in out
+
+
+@pytest.mark.usefixtures("use_orjson")
+@pytest.mark.parametrize("data", ['{"id": 1}', b'{"id": 1}'])
+def test_json_loads(data):
+    assert json_loads(data) == {"id": 1}
+
+
+@pytest.mark.usefixtures("use_orjson")
+def test_json_loads_error():
+    with pytest.raises(json.JSONDecodeError):
+        json_loads("test")
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, None),
+        ("2022-01-01", datetime(2022, 1, 1)),
+        ("2022-01-01 01:02:03", datetime(2022, 1, 1, 1, 2, 3)),
+        ("2030-01-01T00:00:00+00:00", datetime(2030, 1, 1)),
+        ("2030-01-01T02:00:00+02:00", datetime(2030, 1, 1)),
+    ],
+)
+def test_parse_datetime(value, expected):
+    assert parse_datetime(value, "--expires-at") == expected
+
+
+def test_parse_datetime_invalid():
+    with pytest.raises(BadParameter):
+        parse_datetime("test", "--expires-at")
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "UTF8", "latin-1"])
+def test_read_documents_file(encoding, tmp_path):
+    file_path = tmp_path / "movies.json"
+    file_path.write_text('[{"id": 1, "title": "Amélie"}]', encoding=encoding)
+
+    assert read_documents_file(file_path, encoding) == '[{"id": 1, "title": "Amélie"}]'.encode()
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_send_documents_in_batches(concurrency):
+    documents = [{"id": x} for x in range(7)]
+
+    result = send_documents_in_batches(
+        lambda batch, primary_key: {"batch": batch, "primaryKey": primary_key},
+        documents,
+        3,
+        "id",
+        concurrency,
+    )
+
+    assert [x["batch"] for x in result] == [documents[:3], documents[3:6], documents[6:]]
+    assert all(x["primaryKey"] == "id" for x in result)
+
+
+def test_send_documents_in_batches_bounded():
+    sent: list = []
+
+    def documents():
+        for x in range(20):
+            # With 2 documents per batch and 2 batches in flight the batch being read can only be
+            # 2 ahead of the ones that have finished
+            assert x // 2 - len(sent) <= 2
+            yield {"id": x}
+
+    def request_method(batch, primary_key):
+        sleep(0.01)
+        sent.append(batch)
+        return {"batch": batch}
+
+    result = send_documents_in_batches(request_method, documents(), 2, None, 2)
+
+    assert [x["batch"][0]["id"] for x in result] == list(range(0, 20, 2))
+
+
+@pytest.mark.parametrize(
+    "documents, keep_header, expected",
+    [
+        (b"a\nb\nc\n", False, [b"a\nb\n", b"c\n"]),
+        (b"a\nb\nc", False, [b"a\nb\n", b"c"]),
+        (b"id\n1\n2\n3\n", True, [b"id\n1\n2\n", b"id\n3\n"]),
+        (b"id", True, [b"id"]),
+        (b"", False, []),
+    ],
+)
+def test_split_documents(documents, keep_header, expected):
+    assert list(split_documents(documents, 2, keep_header)) == expected
+
+
 @patch("requests.get")
 def test_check_index_status_error(mock_get, client):
     def mock_response(*args, **kwargs):
@@ -76,7 +272,7 @@ def test_process_request_wait_fail_single(mock_get, test_runner, index_uid, empt
 @pytest.mark.usefixtures("env_vars")
 @patch.object(Index, "wait_for_task")
 def test_process_request_wait_fail_multi(
-    mock_get, test_runner, index_uid, empty_index, small_movies
+    mock_get, test_runner, index_uid, empty_index, small_movies_json
 ):
     empty_index()
     mock_get.side_effect = [
@@ -95,7 +291,7 @@ def test_process_request_wait_fail_multi(
         "documents",
         "add-in-batches",
         index_uid,
-        json.dumps(small_movies),
+        small_movies_json,
         "--batch-size",
         2,
         "-w",
@@ -9,7 +9,7 @@ from meilisearch.index import Index
 from requests.models import Response
 
 from meilisearch_cli.main import app
-from tests.utils import get_update_id_from_output
+from tests.utils import creds_argv, get_update_id_from_output
 
 
 @pytest.mark.parametrize("use_env", [True, False])
@@ -19,14 +19,7 @@ def test_create_index(
 ):
     args = ["index", "create", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
@@ -92,14 +85,7 @@ def test_create_index_no_url_master_key(index_uid, test_runner):
 def test_delete_index(use_env, base_url, master_key, test_runner, index_uid, monkeypatch, client):
     args = ["index", "delete", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     response = client.create_index(index_uid)
     client.wait_for_task(response["uid"])
@@ -140,14 +126,7 @@ def test_delete_index_no_url_maseter_key(index_uid, test_runner):
 def test_get_index(use_env, raw, base_url, master_key, test_runner, index_uid, monkeypatch, client):
     args = ["index", "get", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
@@ -195,14 +174,7 @@ def test_get_indexes(
 ):
     args = ["index", "get-all"]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
@@ -239,14 +211,7 @@ def test_get_primary_key(
 ):
     args = ["index", "get-primary-key", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     primary_key = "id"
     result = client.create_index(index_uid, {"primaryKey": primary_key})
@@ -287,14 +252,7 @@ def test_get_settings(
 ):
     args = ["index", "get-settings", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
@@ -346,14 +304,7 @@ def test_get_settings_error(mock_get, test_runner, index_uid):
 def test_get_stats(use_env, raw, index_uid, base_url, master_key, test_runner, client, monkeypatch):
     args = ["index", "get-stats", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
@@ -400,14 +351,7 @@ def test_get_task(
 ):
     args = ["index", "get-task", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
@@ -466,14 +410,7 @@ def test_reset_displayed_attributes_no_wait(
     index = empty_index()
     args = ["index", "reset-displayed-attributes", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     response = index.update_displayed_attributes(["title", "genre"])
     index.wait_for_task(response["uid"])
@@ -576,14 +513,7 @@ def test_reset_distinct_attribute_no_wait(
 ):
     args = ["index", "reset-distinct-attribute", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     index = client.index(index_uid)
     update = index.update_distinct_attribute("title")
@@ -677,14 +607,7 @@ def test_reset_filterable_attributes_no_wait(
 ):
     args = ["index", "reset-filterable-attributes", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     index = client.index(index_uid)
     update = index.update_displayed_attributes(["title", "genre"])
@@ -762,14 +685,7 @@ def test_reset_ranking_rules_no_wait(
 ):
     args = ["index", "reset-ranking-rules", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     index = client.index(index_uid)
     update = index.update_displayed_attributes(["sort", "words"])
@@ -846,14 +762,7 @@ def test_reset_searchable_attributes_no_wait(
 ):
     args = ["index", "reset-searchable-attributes", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     index = client.index(index_uid)
     update = index.update_displayed_attributes(["title", "genre"])
@@ -925,14 +834,7 @@ def test_reset_settings_no_wait(
 ):
     args = ["index", "reset-settings", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     index = client.index(index_uid)
 
@@ -1058,14 +960,7 @@ def test_reset_stop_words_no_wait(
 ):
     args = ["index", "reset-stop-words", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     index = client.index(index_uid)
     update = index.update_stop_words(["a", "the"])
@@ -1139,14 +1034,7 @@ def test_reset_synonyms_no_wait(
 ):
     args = ["index", "reset-synonyms", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     index = client.index(index_uid)
     update = index.update_synonyms({"logan": ["marval", "wolverine"]})
@@ -1226,14 +1114,7 @@ def test_reset_typo_tolerance_no_wait(
     }
     args = ["index", "reset-typo-tolerance", index_uid]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     index = client.index(index_uid)
     update = index.update_typo_tolerance(typo_tolerance_update)
@@ -1316,14 +1197,7 @@ def test_update_displayed_attributes_no_wait(
 ):
     args = ["index", "update-displayed-attributes", index_uid, "genre", "title"]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     response = client.create_index(index_uid)
     client.wait_for_task(response["uid"])
@@ -1400,14 +1274,7 @@ def test_update_distinct_attribute(
     if wait_flag:
         args.append(wait_flag)
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
@@ -1450,14 +1317,7 @@ def test_update_index(
     primary_key = "title"
     args = ["index", "update", index_uid, primary_key]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
@@ -1531,14 +1391,7 @@ def test_update_ranking_rules_no_wait(
 ):
     args = ["index", "update-ranking-rules", index_uid, "sort", "words"]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     response = client.create_index(index_uid)
     client.wait_for_task(response["uid"])
@@ -1599,14 +1452,7 @@ def test_update_searchable_attributes_no_wait(
 ):
     args = ["index", "update-searchable-attributes", index_uid, "genre", "title"]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     response = client.create_index(index_uid)
     client.wait_for_task(response["uid"])
@@ -1720,14 +1566,7 @@ def test_update_settings_no_wait(
         args.append("--stop-words")
         args.append(word)
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
@@ -1891,14 +1730,7 @@ def test_update_sortable_attributes_no_wait(
 ):
     args = ["index", "update-sortable-attributes", index_uid, "genre", "title"]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     response = client.create_index(index_uid)
     client.wait_for_task(response["uid"])
@@ -1961,14 +1793,7 @@ def test_update_stop_words_no_wait(
 ):
     args = ["index", "update-stop-words", index_uid, "a", "the"]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     response = client.create_index(index_uid)
     client.wait_for_task(response["uid"])
@@ -2029,14 +1854,7 @@ def test_update_synonyms_no_wait(
 ):
     args = ["index", "update-synonyms", index_uid, '{"logan": ["marvel", "wolverine"]}']
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     response = client.create_index(index_uid)
     client.wait_for_task(response["uid"])
@@ -2117,14 +1935,7 @@ def test_update_typo_tolerance_no_wait(
     typo_tolerance = '{"enabled": false, "disableOnAttributes": ["title"], "disableOnWords": ["spiderman"], "minWordSizeForTypos": {"oneTypo": 10, "twoTypos": 20}}'
     args = ["index", "update-typo-tolerance", index_uid, typo_tolerance]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     response = client.create_index(index_uid)
     client.wait_for_task(response["uid"])
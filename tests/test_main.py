@@ -5,12 +5,14 @@ from unittest.mock import patch
 
 import jwt
 import pytest
-from meilisearch.errors import MeiliSearchApiError
+import requests
+from meilisearch.errors import MeiliSearchApiError, MeiliSearchTimeoutError
 from meilisearch.index import Index
 from requests.models import Response
 from tomlkit import parse
 
 from meilisearch_cli.main import __version__, app
+from tests.utils import creds_argv
 
 
 @pytest.fixture
@@ -193,6 +195,17 @@ def test_generate_tenant_token_with_expire_date(test_runner, default_search_key)
     assert expected in out
 
 
+@pytest.mark.usefixtures("env_vars")
+def test_generate_tenant_token_expire_date_with_offset(test_runner):
+    api_key = "abcdefgh12345678"
+    args = ["generate-tenant-token", "*", api_key, "--expires-at", "2030-01-01T02:00:00+02:00"]
+    runner_result = test_runner.invoke(app, args, catch_exceptions=False)
+    token = "".join(line.strip("│ ") for line in runner_result.stdout.splitlines()[1:-1])
+    payload = jwt.decode(token, api_key, algorithms=["HS256"])
+
+    assert payload["exp"] == int(datetime.timestamp(datetime(2030, 1, 1)))
+
+
 @pytest.mark.usefixtures("env_vars")
 def test_generate_tenant_token_all_search_rules(test_runner, default_search_key):
     search_rules = "*"
@@ -245,14 +258,7 @@ def test_get_key(test_key, test_runner):
 def test_get_keys(use_env, raw, base_url, master_key, test_runner, monkeypatch):
     args = ["get-keys"]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
@@ -346,14 +352,7 @@ def test_get_keys_no_url_master_key(test_runner):
 def test_get_version(use_env, raw, base_url, master_key, test_runner, monkeypatch):
     args = ["get-version"]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
@@ -403,6 +402,16 @@ def test_health(use_env, raw, base_url, master_key, test_runner, monkeypatch):
         assert "}" in out
 
 
+@pytest.mark.usefixtures("env_vars")
+@patch("meilisearch_cli.main.requests.get")
+def test_health_timeout(mock_get, test_runner):
+    mock_get.side_effect = requests.exceptions.ConnectTimeout("timed out")
+    with pytest.raises(MeiliSearchTimeoutError):
+        test_runner.invoke(app, ["health"], catch_exceptions=False)
+
+    assert mock_get.call_args[1]["timeout"] == 2
+
+
 def test_health_no_url(test_runner):
     runner_result = test_runner.invoke(app, ["health"])
     out = runner_result.stdout
@@ -415,31 +424,19 @@ def test_health_no_url(test_runner):
 def test_search_basic(
     use_env,
     raw,
-    index_uid,
     base_url,
     master_key,
     test_runner,
-    client,
-    small_movies,
+    populated_index,
     monkeypatch,
 ):
-    args = ["search", index_uid, "How to Train Your Dragon"]
+    args = ["search", populated_index.uid, "How to Train Your Dragon"]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     if raw:
         args.append("--raw")
 
-    index = client.index(index_uid)
-    update = index.add_documents(small_movies)
-    index.wait_for_task(update["uid"])
     runner_result = test_runner.invoke(app, args)
 
     out = runner_result.stdout
@@ -450,6 +447,56 @@ def test_search_basic(
         assert "}" in out
 
 
+@pytest.mark.usefixtures("env_vars")
+@pytest.mark.parametrize("raw", [True, False])
+def test_search_multiple_queries(raw, test_runner, populated_index):
+    args = [
+        "search",
+        populated_index.uid,
+        "How to Train Your Dragon",
+        "--query",
+        "Captain Marvel",
+        "--concurrency",
+        "2",
+    ]
+
+    if raw:
+        args.append("--raw")
+
+    runner_result = test_runner.invoke(app, args)
+
+    out = runner_result.stdout
+    assert "166428" in out
+    assert "299537" in out
+
+    if not raw:
+        assert 'Search Results for "How to Train Your Dragon"' in out
+        assert 'Search Results for "Captain Marvel"' in out
+
+
+@pytest.mark.usefixtures("env_vars")
+def test_search_compact(test_runner, populated_index):
+    runner_result = test_runner.invoke(
+        app, ["search", populated_index.uid, "Captain Marvel", "--compact"]
+    )
+
+    out = runner_result.stdout
+    assert "299537" in out
+    assert 'Query: "Captain Marvel"' in out
+    assert "Search Results" not in out
+
+
+@pytest.mark.usefixtures("env_vars")
+@patch.object(Index, "search")
+def test_search_many_hits_compact(mock_search, index_uid, test_runner):
+    mock_search.return_value = {"hits": [{"id": i} for i in range(101)], "query": "test"}
+    runner_result = test_runner.invoke(app, ["search", index_uid, "test"])
+
+    out = runner_result.stdout
+    assert '"id": 100' in out
+    assert "Search Results" not in out
+
+
 @pytest.mark.parametrize("use_env", [True, False])
 def test_search_full(
     use_env,
@@ -496,14 +543,7 @@ def test_search_full(
         "title:asc",
     ]
 
-    if use_env:
-        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
-        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
-    else:
-        args.append("--url")
-        args.append(base_url)
-        args.append("--master-key")
-        args.append(master_key)
+    args += creds_argv(use_env, base_url, master_key, monkeypatch)
 
     update = index.add_documents(small_movies)
     index.wait_for_task(update["uid"])
@@ -536,6 +576,19 @@ def test_search_index_not_found_error(test_runner, index_uid):
     assert "not found" in out
 
 
+@pytest.mark.usefixtures("env_vars")
+@patch.object(Index, "search")
+def test_search_repeated_query(mock_search, test_runner, index_uid):
+    mock_search.return_value = {"hits": [{"id": "1"}], "query": "test"}
+    runner_result = test_runner.invoke(
+        app, ["search", index_uid, "test", "--query", "test", "--raw"]
+    )
+    out = runner_result.stdout
+
+    assert mock_search.call_count == 1
+    assert out.count("query") == 2
+
+
 @pytest.mark.usefixtures("env_vars")
 @patch.object(Index, "search")
 def test_search_error(mock_get, test_runner, index_uid):
@@ -1,11 +1,49 @@
 import json
 import re
+import time
+
+
+def creds_argv(use_env, base_url, master_key, monkeypatch):
+    if use_env:
+        monkeypatch.setenv("MEILI_HTTP_ADDR", base_url)
+        monkeypatch.setenv("MEILI_MASTER_KEY", master_key)
+        return []
+
+    return ["--url", base_url, "--master-key", master_key]
 
 
 def get_update_id_from_output(output):
+    # --raw output is plain JSON so it is loaded directly, panel output has to be searched
+    try:
+        task = json.loads(output)
+    except json.JSONDecodeError:
+        pass
+    else:
+        if isinstance(task, list):
+            return [x["uid"] for x in task]
+        return task["uid"]
+
     if "[" in output:
         update_ids = re.findall(r"{.*?}+", output)
         return [json.loads(x.replace("'", '"'))["uid"] for x in update_ids]
 
     update_id = re.search(r"\d+", output)
     return update_id.group()  # type: ignore
+
+
+def wait_quick(index, uid, timeout_in_ms=10_000):
+    # Fails a stuck task in seconds instead of waiting on the test timeout. The poll interval comes
+    # from the fast_wait_for_task fixture.
+    return index.wait_for_task(uid, timeout_in_ms=timeout_in_ms)
+
+
+def wait_for_all_tasks(index, timeout=60, interval=0.05):
+    # One request per poll for all of the index's tasks instead of waiting on each task in turn
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        tasks = index.get_tasks()["results"]
+        if all(task["status"] in ("succeeded", "failed") for task in tasks):
+            return
+        time.sleep(interval)
+
+    raise TimeoutError(f"Tasks for {index.uid} did not finish within {timeout} seconds")